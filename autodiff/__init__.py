@@ -3,9 +3,17 @@ import builtins
 
 import autodiff as ad
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 from autodiff import base
 from autodiff.base import *
 
+from autodiff import cache
+from autodiff.cache import *
+
 from autodiff import operators
 
 from autodiff import functions
@@ -14,9 +22,41 @@ from autodiff.functions import *
 from autodiff import trigonometry
 from autodiff.trigonometry import *
 
+from autodiff import tensor
+from autodiff.tensor import *
+
 from autodiff import simplify
 from autodiff.simplify import *
 
+from autodiff import outofcore
+from autodiff.outofcore import *
+
+from autodiff import cost
+from autodiff.cost import *
+
+from autodiff import interval
+from autodiff.interval import *
+
+from autodiff import polynomial
+from autodiff.polynomial import *
+
+from autodiff import passes
+from autodiff.passes import *
+
+from autodiff import kernel
+from autodiff.kernel import *
+
+from autodiff import reverse
+from autodiff.reverse import *
+
+from autodiff import optimize
+
+from autodiff import server
+from autodiff.server import *
+
+from autodiff import profiling
+from autodiff.profiling import *
+
 
 def _is_neg(op: Base) -> bool:
     if isinstance(op, (FloatConst, IntConst)):
@@ -53,3 +93,8 @@ def _to_float(value: complex) -> float:
     if math.isclose(value.imag, 0.0):
         return value.real
     return float("nan")
+
+
+def _to_float_array(values):
+    values = np.asarray(values, dtype=complex)
+    return np.where(values.imag == 0.0, values.real, float("nan"))
@@ -1,15 +1,68 @@
 from __future__ import annotations
-from abc import ABC, abstractmethod
-from typing import Dict, Union, Tuple, List
+from abc import ABCMeta, abstractmethod
+from typing import (
+    Any, AsyncIterable, AsyncIterator, Callable, Dict, Iterable, Iterator, Union, Tuple, List,
+    Optional, Sequence
+)
 import functools
+import itertools
 import math
+import numbers
 
 import autodiff as ad
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
-class Base(ABC):
+
+_ANNOTATIONS = ("_hash", "_shape", "_shaped")
+
+
+def _structural_hash(op: Base) -> int:
+    try:
+        return op.__dict__["_hash"]
+    except KeyError:
+        pass
+    operands = op.get_operands()
+    if operands:
+        result = hash((type(op), *operands))
+    else:
+        result = hash((type(op), getattr(op, "value", None)))
+    object.__setattr__(op, "_hash", result)
+    return result
+
+
+class _Node(ABCMeta):
+    def __new__(mcls, name, bases, namespace, **kwargs):
+        if "__eq__" in namespace and "__hash__" not in namespace:
+            namespace["__hash__"] = _structural_hash
+        return super().__new__(mcls, name, bases, namespace, **kwargs)
+
+    # nodes are never registered as virtual subclasses
+    __instancecheck__ = type.__instancecheck__
+    __subclasscheck__ = type.__subclasscheck__
+
+
+class Base(metaclass=_Node):
     priority: int = -1
     name: str = None # type: ignore
+    cost: int = 1
+
+    def __setattr__(self, name, value):
+        if name in self.__dict__:
+            raise AttributeError(f"{type(self).__name__} is immutable")
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __getstate__(self):
+        return {
+            name: value for name, value in self.__dict__.items()
+            if name not in _ANNOTATIONS
+        }
     
     @abstractmethod
     def _call(self, vars: Dict[str, Union[complex, float, int]]) -> complex:
@@ -19,6 +72,42 @@ class Base(ABC):
     def _derivative(self, var: Variable) -> Base:
         pass
 
+    def _apply(self, *values):
+        raise NotImplementedError(f"{type(self).__name__} has no operand evaluation")
+
+    def _array_call(self, vars):
+        return self._array_apply(*(op._array_call(vars) for op in self.get_operands()))
+
+    def _array_apply(self, *values):
+        raise NotImplementedError(f"{type(self).__name__} has no array evaluation")
+
+    def _batch_apply(self, *values):
+        return self._array_apply(*values)
+
+    def _interval_call(self, boxes):
+        return self._interval_apply(*(op._interval_call(boxes) for op in self.get_operands()))
+
+    def _interval_apply(self, *values):
+        raise NotImplementedError(f"{type(self).__name__} has no interval evaluation")
+
+    def _partials(self) -> List[Base]:
+        raise NotImplementedError(f"{type(self).__name__} has no local partials")
+
+    def _local_partials(self, values: List[complex], result: complex) -> List[complex]:
+        raise NotImplementedError(f"{type(self).__name__} has no numeric partials")
+
+    def node_cost(self) -> int:
+        return self.cost
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        try:
+            return self.__dict__["_shape"]
+        except KeyError:
+            pass
+        _annotate(self, "_shape", _has_shape, _operand_shape)
+        return self.__dict__["_shape"]
+
     @abstractmethod
     def get_operands(self) -> List[Base]:
         pass
@@ -27,9 +116,14 @@ class Base(ABC):
     def get_variables(self) -> set[Variable]:
         pass
     
-    @abstractmethod
+    def with_operands(self, *ops: Base) -> Base:
+        operands = self.get_operands()
+        if len(ops) == len(operands) and all(a is b for a, b in zip(ops, operands)):
+            return self
+        return type(self)(*ops)
+
     def copy(self) -> Base:
-        pass
+        return self
     
     @abstractmethod
     def __str__(self) -> str:
@@ -43,16 +137,124 @@ class Base(ABC):
         self, vars: Dict[str, Union[complex, float, int]] = {}, **kwargs
     ) -> complex:
         vars = {**vars, **kwargs}
+        shaped = self._shaped_variables()
+        if shaped:
+            return self._tensor_call(vars, shaped)
         try:
             return complex(self._call(vars))
         except (ValueError, ArithmeticError):
             return float("nan")
 
+    def _tensor_call(self, vars, shaped: Sequence[Variable]):
+        try:
+            result = self.array_call(_tensor_inputs(vars, shaped))
+        except ValueError:
+            return float("nan")
+        return complex(result) if result.ndim == 0 else result
+
+    def _shaped_variables(self) -> Tuple[Variable, ...]:
+        try:
+            return self.__dict__["_shaped"]
+        except KeyError:
+            pass
+        _annotate(self, "_shaped", lambda op: "_shaped" in op.__dict__, _shaped_operands)
+        return self.__dict__["_shaped"]
+
     def fcall(
         self, vars: Dict[str, Union[complex, float, int]] = {}, **kwargs
-    ) -> float:
-        return ad._to_float(self.call(vars, **kwargs))
-        
+    ):
+        result = self.call(vars, **kwargs)
+        if np is not None and isinstance(result, np.ndarray):
+            return ad._to_float_array(result)
+        return ad._to_float(result)
+
+    def array_call(self, vars: Dict[str, Sequence] = {}, **kwargs):
+        if np is None:
+            raise ImportError("array_call requires numpy")
+        vars = {**vars, **kwargs}
+        vars = {name: np.asarray(value, dtype=complex) for name, value in vars.items()}
+        with np.errstate(all="ignore"):
+            result = np.array(self._array_call(vars), dtype=complex)
+        result[~np.isfinite(result)] = float("nan")
+        return result
+
+    def interval_call(self, boxes: Dict[str, Any] = {}, **kwargs):
+        return ad.interval.evaluate(self, boxes, **kwargs)
+
+    def compile(self, optimize: bool = True, assume_positive: bool = False):
+        return ad.cache.kernels.get_or_compute(
+            _cache_key(self, optimize, assume_positive),
+            lambda: ad.kernel.Kernel(self, optimize, assume_positive),
+        )
+
+    def batch_call(
+        self, records: Sequence, names: Optional[Sequence[str]] = None
+    ) -> List[complex]:
+        return self.compile().batch(records, names)
+
+    def stream(
+        self,
+        iterable: Iterable,
+        chunk_size: int = 1024,
+        names: Optional[Sequence[str]] = None,
+    ) -> Iterator[complex]:
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be positive, not {chunk_size}")
+        if names is None:
+            names = sorted(var.var_name for var in self.get_variables())
+        kernel = self.compile()
+        iterator = iter(iterable)
+        while True:
+            chunk = list(itertools.islice(iterator, chunk_size))
+            if not chunk:
+                return
+            yield from kernel.batch(chunk, names)
+
+    async def astream(
+        self,
+        iterable: AsyncIterable,
+        chunk_size: int = 1024,
+        names: Optional[Sequence[str]] = None,
+    ) -> AsyncIterator[complex]:
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be positive, not {chunk_size}")
+        if names is None:
+            names = sorted(var.var_name for var in self.get_variables())
+        kernel = self.compile()
+        chunk = []
+        async for record in iterable:
+            chunk.append(record)
+            if len(chunk) == chunk_size:
+                for value in kernel.batch(chunk, names):
+                    yield value
+                chunk = []
+        for value in kernel.batch(chunk, names):
+            yield value
+
+    def gradient_call(
+        self,
+        vars: Dict[str, Union[complex, float, int]],
+        wrt: Optional[Sequence[Union[Variable, str]]] = None,
+        budget: Optional[int] = None,
+        strategy: str = "sqrt",
+    ):
+        return ad.reverse.evaluate_gradient(self, vars, wrt, budget, strategy)
+
+    def hvp(
+        self,
+        vars: Dict[str, Union[complex, float, int]],
+        v: Union[Dict[str, Union[complex, float, int]], Sequence],
+        wrt: Optional[Sequence[Union[Variable, str]]] = None,
+    ) -> List[complex]:
+        return ad.reverse.hessian_vector_product(self, vars, v, wrt)
+
+    def batch_hvp(
+        self,
+        vars: Dict[str, Union[complex, float, int]],
+        vs: Sequence,
+        wrt: Optional[Sequence[Union[Variable, str]]] = None,
+    ):
+        return ad.reverse.batch_hessian_vector_product(self, vars, vs, wrt)
 
     def derivative(self, *vars: Union[Tuple[Variable, int], Variable]) -> Base:
         for var in vars:
@@ -63,54 +265,75 @@ class Base(ABC):
             if not isinstance(var, Variable):
                 raise TypeError(f"var must be Variable, not {type(var)}")
             for i in range(k):
-                self = self._derivative(var).simplify()
+                self = ad.cache.derivatives.get_or_compute(
+                    _cache_key(self, var, var.shape),
+                    lambda: self._derivative(var).simplify(),
+                )
         return self
     
-    def simplify(self):
-        return ad.simplify.basesimp(self)
+    def simplify(self, workers: Optional[int] = None):
+        return ad.simplify.basesimp(self, workers)
     
     def __neg__(self) -> Base:
         return ad.operators.Neg(self)
 
     def __add__(self, other) -> Base:
-        return ad.operators.Add(self, other)
+        return ad.operators.add(self, other)
 
     def __radd__(self, other) -> Base:
-        return ad.operators.Add(other, self)
+        return ad.operators.add(other, self)
 
     def __sub__(self, other) -> Base:
-        return ad.operators.Add(self, -other)
+        return ad.operators.add(self, ad.operators.Neg(other))
 
     def __rsub__(self, other) -> Base:
-        return ad.operators.Add(other, -self)
+        return ad.operators.add(other, ad.operators.Neg(self))
 
     def __mul__(self, other) -> Base:
-        return ad.operators.Mul(self, other)
+        return ad.operators.mul(self, other)
 
     def __rmul__(self, other) -> Base:
-        return ad.operators.Mul(other, self)
+        return ad.operators.mul(other, self)
 
     def __truediv__(self, other) -> Base:
-        return ad.operators.Mul(self, ad.operators.Inv(other))
+        return ad.operators.mul(self, ad.operators.Inv(other))
 
     def __rtruediv__(self, other) -> Base:
-        return ad.operators.Mul(other, ad.operators.Inv(self))
+        return ad.operators.mul(other, ad.operators.Inv(self))
     
     def __pow__(self, other) -> Base:
-        return ad.operators.Pow(self, other)
+        return ad.operators.power(self, other)
     def __rpow__(self, other) -> Base:
-        return ad.operators.Pow(other, self)
+        return ad.operators.power(other, self)
         
 
 
 class Variable(Base):
     name = "variable"
-    def __init__(self, name: str):
+    cost = 0
+    def __init__(self, name: str, shape: Optional[Sequence[int]] = None):
         self.var_name = str(name)
+        self.var_shape = tuple(int(n) for n in shape) if shape is not None else ()
+
+    @property
+    def shape(self):
+        return self.var_shape
 
     def _call(self, vars):
         try:
-            return complex(vars[self.name])
+            return complex(vars[self.var_name])
+        except KeyError:
+            raise ValueError(f"unknown variable: {self.var_name}")
+
+    def _array_call(self, vars):
+        try:
+            return vars[self.var_name]
+        except KeyError:
+            raise ValueError(f"unknown variable: {self.var_name}")
+
+    def _interval_call(self, boxes):
+        try:
+            return boxes[self.var_name]
         except KeyError:
             raise ValueError(f"unknown variable: {self.var_name}")
 
@@ -123,29 +346,39 @@ class Variable(Base):
     def get_variables(self):
         return {self}
     
-    def copy(self):
-        return Variable(self.var_name)
-    
     def __str__(self):
         return self.var_name
 
     def __eq__(self, other):
         if isinstance(other, str):
             other = Variable(other)
-        return isinstance(other, Variable) and self.var_name == other.var_name
+        return (
+            isinstance(other, Variable)
+            and self.var_name == other.var_name
+            and self.var_shape == other.var_shape
+        )
 
     def __hash__(self):
-        return hash(self.var_name)
+        return hash((self.var_name, self.var_shape))
 
 
 class ComplexConst(Base):
     name = "complexconst"
+    cost = 0
     def __init__(self, value: complex):
         self.value = complex(value)
 
     def _call(self, vars):
         return self.value
 
+    def _array_apply(self):
+        return np.complex128(self.value)
+
+    def _interval_apply(self):
+        if self.value.imag:
+            raise ValueError(f"no real interval for complex constant: {self.value}")
+        return ad.interval.point(self.value.real)
+
     def _derivative(self, var):
         return Const(0)
 
@@ -153,11 +386,8 @@ class ComplexConst(Base):
         return []
 
     def get_variables(self):
-        return {}
+        return set()
     
-    def copy(self):
-        return ComplexConst(self.value)
-
     def __str__(self):
         return str(self.value)
 
@@ -169,12 +399,19 @@ class ComplexConst(Base):
 
 class FloatConst(Base):
     name = "floatconst"
+    cost = 0
     def __init__(self, value: float):
         self.value = float(value)
 
     def _call(self, vars):
         return self.value
 
+    def _array_apply(self):
+        return np.complex128(self.value)
+
+    def _interval_apply(self):
+        return ad.interval.point(self.value)
+
     def _derivative(self, var):
         return Const(0)
 
@@ -182,11 +419,8 @@ class FloatConst(Base):
         return []
 
     def get_variables(self):
-        return {}
+        return set()
     
-    def copy(self):
-        return FloatConst(self.value)
-
     def __str__(self):
         return str(self.value)
 
@@ -198,12 +432,19 @@ class FloatConst(Base):
 
 class IntConst(Base):
     name = "intconst"
+    cost = 0
     def __init__(self, value: int):
         self.value = int(value)
 
     def _call(self, vars):
         return self.value
 
+    def _array_apply(self):
+        return np.complex128(self.value)
+
+    def _interval_apply(self):
+        return ad.interval.point(self.value)
+
     def _derivative(self, var):
         return Const(0)
 
@@ -211,11 +452,8 @@ class IntConst(Base):
         return []
 
     def get_variables(self):
-        return {}
+        return set()
     
-    def copy(self):
-        return IntConst(self.value)
-
     def __str__(self):
         return str(self.value)
 
@@ -227,6 +465,7 @@ class IntConst(Base):
 
 class Constant(Base):
     name = "constant"
+    cost = 0
     
     def __init__(self, name: str, value: float):
         self.const_name = name
@@ -235,6 +474,12 @@ class Constant(Base):
     def _call(self, vars):
         return self.value
 
+    def _array_apply(self):
+        return np.complex128(self.value)
+
+    def _interval_apply(self):
+        return ad.interval.widen(self.value, self.value)
+
     def _derivative(self, var):
         return Const(0)
 
@@ -242,11 +487,8 @@ class Constant(Base):
         return []
 
     def get_variables(self):
-        return {}
+        return set()
     
-    def copy(self):
-        return Constant(self.const_name, self.value)
-
     def __str__(self):
         return self.const_name
 
@@ -256,23 +498,85 @@ class Constant(Base):
         return self.const_name == other.const_name and self.value == other.value
 
  
+def _cache_key(op: Base, *extra) -> Tuple:
+    shapes = sorted((var.var_name, var.shape) for var in op.get_variables() if var.shape)
+    return (op, tuple(shapes), *extra)
+
+
+def _annotate(op: Base, key: str, ready: Callable[[Base], bool], compute: Callable[[Base], Any]):
+    stack = [op]
+    while stack:
+        node = stack[-1]
+        if ready(node):
+            stack.pop()
+            continue
+        missing = [operand for operand in node.get_operands() if not ready(operand)]
+        if missing:
+            stack.extend(missing)
+            continue
+        object.__setattr__(node, key, compute(node))
+        stack.pop()
+
+
+def _has_shape(op: Base) -> bool:
+    return "_shape" in op.__dict__ or type(op).shape is not Base.shape
+
+
+def _operand_shape(op: Base) -> Tuple[int, ...]:
+    return _broadcast_shapes(*(operand.shape for operand in op.get_operands()))
+
+
+def _shaped_operands(op: Base) -> Tuple[Variable, ...]:
+    operands = op.get_operands()
+    if not operands:
+        return tuple(var for var in op.get_variables() if var.shape)
+    return tuple(dict.fromkeys(
+        var for operand in operands for var in operand.__dict__["_shaped"]
+    ))
+
+
+def _tensor_inputs(vars: Dict, shaped: List[Variable]) -> Dict:
+    if np is None:
+        raise ImportError("evaluating shaped variables requires numpy")
+    vars = dict(vars)
+    for var in shaped:
+        if var.var_name in vars:
+            value = np.asarray(vars[var.var_name], dtype=complex)
+            vars[var.var_name] = np.broadcast_to(value, var.shape)
+    return vars
+
+
+def _broadcast_shapes(*shapes: Tuple[int, ...]) -> Tuple[int, ...]:
+    result: List[int] = []
+    for shape in shapes:
+        for i in range(1, len(shape) + 1):
+            n = shape[-i]
+            if i > len(result):
+                result.insert(0, n)
+            elif result[-i] == 1:
+                result[-i] = n
+            elif n != 1 and n != result[-i]:
+                raise ValueError(f"shapes {shapes} cannot be broadcast together")
+    return tuple(result)
+
+
 def Const(value: Union[complex, float, int]) -> Base:
-    if isinstance(value, complex):
-        return ComplexConst(value)
-    if isinstance(value, float):
-        return FloatConst(value)
-    if isinstance(value, int):
+    if isinstance(value, numbers.Integral):
         return IntConst(value)
+    if isinstance(value, numbers.Real):
+        return FloatConst(value)
+    if isinstance(value, numbers.Complex):
+        return ComplexConst(value)
     raise TypeError(f"Type {type(value)} cannot be converted to a constant")
 
 
 def to_op(obj: Union[complex, float, int, str, Base]) -> Base:
-    if isinstance(obj, (complex, float, int)):
+    if isinstance(obj, Base):
+        return obj
+    if isinstance(obj, numbers.Number):
         return Const(obj)
     if isinstance(obj, str):
         return Variable(obj)
-    if isinstance(obj, Base):
-        return obj
     raise TypeError(f"Type {type(obj)} cannot be converted to a Base class")
 
 
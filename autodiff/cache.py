@@ -0,0 +1,80 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List
+import threading
+
+
+class StripedCache:
+    def __init__(self, maxsize: int = 1024, stripes: int = 16):
+        if maxsize < 1 or stripes < 1:
+            raise ValueError("maxsize and stripes must be positive")
+        self.stripe_size = max(maxsize // stripes, 1)
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._stripes: List["OrderedDict[Hashable, Any]"] = [OrderedDict() for _ in range(stripes)]
+        self._hits = [0] * stripes
+        self._misses = [0] * stripes
+
+    def _stripe(self, key: Hashable) -> int:
+        return hash(key) % len(self._stripes)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        index = self._stripe(key)
+        stripe = self._stripes[index]
+        with self._locks[index]:
+            try:
+                value = stripe[key]
+            except KeyError:
+                self._misses[index] += 1
+                return default
+            stripe.move_to_end(key)
+            self._hits[index] += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> Any:
+        index = self._stripe(key)
+        stripe = self._stripes[index]
+        with self._locks[index]:
+            value = stripe.setdefault(key, value)
+            stripe.move_to_end(key)
+            while len(stripe) > self.stripe_size:
+                stripe.popitem(last=False)
+            return value
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = self.put(key, compute())
+        return value
+
+    def clear(self):
+        for lock, stripe in zip(self._locks, self._stripes):
+            with lock:
+                stripe.clear()
+
+    def __len__(self) -> int:
+        return sum(len(stripe) for stripe in self._stripes)
+
+    def stats(self) -> Dict[str, int]:
+        hits = misses = size = 0
+        for index, lock in enumerate(self._locks):
+            with lock:
+                hits += self._hits[index]
+                misses += self._misses[index]
+                size += len(self._stripes[index])
+        return {"hits": hits, "misses": misses, "size": size}
+
+
+derivatives = StripedCache()
+kernels = StripedCache(maxsize=256)
+evaluators = StripedCache(maxsize=64)
+tangent_programs = StripedCache(maxsize=64)
+
+
+def clear():
+    derivatives.clear()
+    kernels.clear()
+    evaluators.clear()
+    tangent_programs.clear()
+
+
+__all__ = ["StripedCache", "derivatives", "kernels", "evaluators", "tangent_programs", "clear"]
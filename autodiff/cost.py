@@ -0,0 +1,73 @@
+from typing import Dict, List, NamedTuple, Tuple
+
+import autodiff as ad
+
+
+class Metrics(NamedTuple):
+    nodes: int
+    tree_nodes: int
+    depth: int
+    distinct: int
+    cost: int
+    dag_cost: int
+
+
+def postorder(op: ad.Base) -> List[ad.Base]:
+    order, seen = [], set()
+    stack: List[Tuple[ad.Base, bool]] = [(op, False)]
+    while stack:
+        op, expanded = stack.pop()
+        if expanded:
+            order.append(op)
+            continue
+        if id(op) in seen:
+            continue
+        seen.add(id(op))
+        stack.append((op, True))
+        stack.extend((child, False) for child in reversed(op.get_operands()))
+    return order
+
+
+def _leaf_key(op: ad.Base) -> tuple:
+    return type(op), str(op), op.shape, getattr(op, "value", None)
+
+
+def structure(order: List[ad.Base]) -> Dict[int, int]:
+    keys: Dict[tuple, int] = {}
+    classes: Dict[int, int] = {}
+    for op in order:
+        operands = op.get_operands()
+        if operands:
+            key = (type(op), *(classes[id(child)] for child in operands))
+        else:
+            key = _leaf_key(op)
+        classes[id(op)] = keys.setdefault(key, len(keys))
+    return classes
+
+
+def metrics(op: ad.Base) -> Metrics:
+    order = postorder(op)
+    classes = structure(order)
+
+    tree_nodes: Dict[int, int] = {}
+    depth: Dict[int, int] = {}
+    cost: Dict[int, int] = {}
+    dag_cost: Dict[int, int] = {}
+    for node in order:
+        operands = node.get_operands()
+        tree_nodes[id(node)] = 1 + sum(tree_nodes[id(child)] for child in operands)
+        depth[id(node)] = 1 + max((depth[id(child)] for child in operands), default=0)
+        cost[id(node)] = node.node_cost() + sum(cost[id(child)] for child in operands)
+        dag_cost.setdefault(classes[id(node)], node.node_cost())
+
+    return Metrics(
+        nodes=len(order),
+        tree_nodes=tree_nodes[id(op)],
+        depth=depth[id(op)],
+        distinct=len(dag_cost),
+        cost=cost[id(op)],
+        dag_cost=sum(dag_cost.values()),
+    )
+
+
+__all__ = ["metrics", "Metrics"]
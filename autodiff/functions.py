@@ -6,6 +6,11 @@ import cmath
 
 import autodiff as ad
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 if not hasattr(math, "cbrt"):
     def _cbrt(x: float) -> float:
@@ -14,6 +19,8 @@ if not hasattr(math, "cbrt"):
     del _cbrt
 
 class Function(ad.Base):
+    cost = 20
+
     def __init__(self, op):
         self.op = ad.to_op(op)
 
@@ -21,18 +28,30 @@ class Function(ad.Base):
         value = self.op._call(vars)
         return self._func_call(value)
 
+    def _apply(self, value):
+        return self._func_call(value)
+
+    def _array_apply(self, value):
+        return self._func_array_call(value)
+
+    def _interval_apply(self, value):
+        return self._func_interval(value)
+
     def _derivative(self, var):
         return self._func_derivative(self.op) * self.op._derivative(var)
 
+    def _partials(self):
+        return [self._func_derivative(self.op)]
+
+    def _local_partials(self, values, result):
+        return [self._func_grad(values[0], result)]
+
     def get_operands(self):
         return [self.op]
 
     def get_variables(self):
         return self.op.get_variables()
 
-    def copy(self):
-        return type(self)(self.op.copy())
-
     def __str__(self):
         return f"{self.name}({self.op})"
 
@@ -49,25 +68,66 @@ class Function(ad.Base):
     def _func_derivative(op: ad.Base) -> ad.Base:
         pass
 
+    @staticmethod
+    def _func_array_call(value):
+        raise NotImplementedError("function has no array evaluation")
+
+    @staticmethod
+    def _func_interval(value):
+        raise NotImplementedError("function has no interval evaluation")
+
+    @staticmethod
+    def _func_grad(value: complex, result: complex) -> complex:
+        raise NotImplementedError("function has no numeric derivative")
+
 
 
 class Exp(Function):
     name = "exp"
+    cost = 20
     
     @staticmethod
     def _func_call(value):
         return cmath.exp(value)
 
+    @staticmethod
+    def _func_array_call(value):
+        return np.exp(value)
+
+    @staticmethod
+    def _func_interval(value):
+        return ad.interval.exp(value)
+
+    @staticmethod
+    def _func_grad(value, result):
+        return result
+
     @staticmethod
     def _func_derivative(op):
         return ad.exp(op)
+
+    def _partials(self):
+        return [self]
      
 class NaturalLog(Function):
     name = "ln"
+    cost = 20
 
     @staticmethod
     def _func_call(value):
-        return math.log(value) # type: ignore
+        return math.log(ad._to_float(value))
+
+    @staticmethod
+    def _func_array_call(value):
+        return np.log(ad._to_float_array(value))
+
+    @staticmethod
+    def _func_interval(value):
+        return ad.interval.log(value)
+
+    @staticmethod
+    def _func_grad(value, result):
+        return 1 / value
 
     @staticmethod
     def _func_derivative(op):
@@ -76,47 +136,133 @@ class NaturalLog(Function):
 
 class Log10(Function):
     name = "lg"
+    cost = 22
 
     @staticmethod
     def _func_call(value):
-        return math.log10(value)# type: ignore
+        return math.log10(ad._to_float(value))
+
+    @staticmethod
+    def _func_array_call(value):
+        return np.log10(ad._to_float_array(value))
+
+    @staticmethod
+    def _func_interval(value):
+        return ad.interval.increasing(np.log10, value, 0.0)
+
+    @staticmethod
+    def _func_grad(value, result):
+        return 1 / (value * math.log(10))
 
     @staticmethod
     def _func_derivative(op):
-        return 1 / (op * ad.lg(10))
+        return 1 / (op * ad.ln(10))
 
 
 class Sqrt(Function):
     name = "sqrt"
+    cost = 8
 
     @staticmethod
     def _func_call(value):
-        return math.sqrt(value) # type: ignore
+        return math.sqrt(ad._to_float(value))
+
+    @staticmethod
+    def _func_array_call(value):
+        return np.sqrt(ad._to_float_array(value))
+
+    @staticmethod
+    def _func_interval(value):
+        return ad.interval.increasing(np.sqrt, value, 0.0)
+
+    @staticmethod
+    def _func_grad(value, result):
+        return 1 / (2 * result)
 
     @staticmethod
     def _func_derivative(op):
         return 1 / (2 * ad.sqrt(op))
 
+    def _partials(self):
+        return [1 / (2 * self)]
+
+
+class RSqrt(Function):
+    name = "rsqrt"
+    cost = 9
+
+    @staticmethod
+    def _func_call(value):
+        return 1 / math.sqrt(ad._to_float(value))
+
+    @staticmethod
+    def _func_array_call(value):
+        return 1 / np.sqrt(ad._to_float_array(value))
+
+    @staticmethod
+    def _func_interval(value):
+        return ad.interval.decreasing(lambda x: 1 / np.sqrt(x), value, 0.0)
+
+    @staticmethod
+    def _func_grad(value, result):
+        return -result / (2 * value)
+
+    @staticmethod
+    def _func_derivative(op):
+        return -ad.rsqrt(op) / (2 * op)
+
+    def _partials(self):
+        return [-self / (2 * self.op)]
+
 
 class Cbrt(Function):
     name = "cbrt"
+    cost = 24
 
     @staticmethod
     def _func_call(value):
         value = ad._to_float(value)
-        return abs(value) ** (1 / 3) * (-1 if value < 0 else 1)
+        return builtins.abs(value) ** (1 / 3) * (-1 if value < 0 else 1)
+
+    @staticmethod
+    def _func_array_call(value):
+        return np.cbrt(ad._to_float_array(value))
+
+    @staticmethod
+    def _func_interval(value):
+        return ad.interval.increasing(np.cbrt, value)
+
+    @staticmethod
+    def _func_grad(value, result):
+        return 1 / (3 * result**2)
 
     @staticmethod
     def _func_derivative(op):
         return 1 / (3 * ad.cbrt(op) ** 2)
 
+    def _partials(self):
+        return [1 / (3 * self**2)]
+
 class Abs(Function):
     name = "abs"
+    cost = 4
 
     @staticmethod
     def _func_call(value):
-        return abs(value)
+        return builtins.abs(value)
     
+    @staticmethod
+    def _func_array_call(value):
+        return np.abs(value)
+
+    @staticmethod
+    def _func_interval(value):
+        return ad.interval.absolute(value)
+
+    @staticmethod
+    def _func_grad(value, result):
+        return builtins.abs(value) / value
+
     @staticmethod
     def _func_derivative(op):
         return abs(op) / op
@@ -127,7 +273,8 @@ ln = NaturalLog
 lg = Log10
 
 sqrt = Sqrt
+rsqrt = RSqrt
 cbrt = Cbrt
 abs = Abs
 
-__all__ = ["Function", "exp", "ln", "lg", "sqrt", "cbrt", "abs"]
+__all__ = ["Function", "exp", "ln", "lg", "sqrt", "rsqrt", "cbrt", "abs"]
@@ -0,0 +1,223 @@
+from typing import Any, Callable, Dict, NamedTuple, Tuple, Union
+import functools
+import math
+
+import autodiff as ad
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+INF = float("inf")
+
+
+class Interval(NamedTuple):
+    lo: Any
+    hi: Any
+
+    @property
+    def width(self):
+        return self.hi - self.lo
+
+    @property
+    def midpoint(self):
+        return (self.lo + self.hi) / 2
+
+    @property
+    def empty(self):
+        return np.isnan(self.lo) | np.isnan(self.hi)
+
+    def contains(self, value):
+        return (self.lo <= value) & (value <= self.hi)
+
+
+def _box(value) -> Interval:
+    if isinstance(value, (Interval, tuple, list)):
+        lo, hi = value
+    else:
+        value = np.asarray(value, dtype=float)
+        if value.ndim == 0:
+            lo = hi = value
+        elif value.shape[-1] == 2:
+            lo, hi = value[..., 0], value[..., 1]
+        else:
+            raise ValueError(f"boxes must have a trailing axis of size 2, not {value.shape}")
+    lo, hi = np.asarray(lo, dtype=float), np.asarray(hi, dtype=float)
+    if np.any(lo > hi):
+        raise ValueError("box lower bounds must not exceed upper bounds")
+    return Interval(lo, hi)
+
+
+def point(value: Union[float, int]) -> Interval:
+    value = np.asarray(value, dtype=float)
+    return Interval(value, value)
+
+
+def widen(lo, hi) -> Interval:
+    return Interval(np.nextafter(lo, -INF), np.nextafter(hi, INF))
+
+
+def clip(value: Interval, low: float, high: float) -> Interval:
+    lo, hi = np.maximum(value.lo, low), np.minimum(value.hi, high)
+    outside = lo > hi
+    return Interval(np.where(outside, np.nan, lo), np.where(outside, np.nan, hi))
+
+
+def neg(value: Interval) -> Interval:
+    return Interval(-value.hi, -value.lo)
+
+
+def add(*values: Interval) -> Interval:
+    lo = functools.reduce(np.add, (value.lo for value in values), 0.0)
+    hi = functools.reduce(np.add, (value.hi for value in values), 0.0)
+    return widen(lo, hi)
+
+
+def _product(x, y):
+    zero = ((x == 0) & ~np.isnan(y)) | ((y == 0) & ~np.isnan(x))
+    return np.where(zero, 0.0, x * y)
+
+
+def mul(*values: Interval) -> Interval:
+    result = point(1.0)
+    for value in values:
+        products = [
+            _product(result.lo, value.lo),
+            _product(result.lo, value.hi),
+            _product(result.hi, value.lo),
+            _product(result.hi, value.hi),
+        ]
+        result = widen(functools.reduce(np.minimum, products), functools.reduce(np.maximum, products))
+    return result
+
+
+def inv(value: Interval) -> Interval:
+    lo, hi = value
+    straddle = (lo < 0) & (hi > 0)
+    new_lo = np.where(straddle | (hi == 0), -INF, 1 / hi)
+    new_hi = np.where(straddle | (lo == 0), INF, 1 / lo)
+    zero = (lo == 0) & (hi == 0)
+    return widen(np.where(zero, np.nan, new_lo), np.where(zero, np.nan, new_hi))
+
+
+def increasing(func: Callable, value: Interval, low: float = -INF, high: float = INF) -> Interval:
+    if low != -INF or high != INF:
+        value = clip(value, low, high)
+    return widen(func(value.lo), func(value.hi))
+
+
+def decreasing(func: Callable, value: Interval, low: float = -INF, high: float = INF) -> Interval:
+    if low != -INF or high != INF:
+        value = clip(value, low, high)
+    return widen(func(value.hi), func(value.lo))
+
+
+def absolute(value: Interval) -> Interval:
+    lo, hi = value
+    low = np.where(lo >= 0, lo, np.where(hi <= 0, -hi, 0.0))
+    return Interval(low, np.maximum(np.abs(lo), np.abs(hi)))
+
+
+def power_int(value: Interval, n: int) -> Interval:
+    if n == 0:
+        return Interval(np.ones_like(value.lo), np.ones_like(value.hi))
+    if n < 0:
+        return inv(power_int(value, -n))
+    if n % 2:
+        return increasing(lambda x: x**n, value)
+    magnitude = absolute(value)
+    result = widen(magnitude.lo**n, magnitude.hi**n)
+    return Interval(np.maximum(result.lo, 0.0), result.hi)
+
+
+def power(base: Interval, exponent: Interval) -> Interval:
+    base_lo, base_hi, exponent_lo, exponent_hi = np.broadcast_arrays(*base, *exponent)
+    result = exp(mul(Interval(exponent_lo, exponent_hi), log(Interval(base_lo, base_hi))))
+    lo, hi = (np.array(bound, dtype=float) for bound in np.broadcast_arrays(*result))
+    # exp(y*log(x)) only covers positive bases; with a negative base the real values
+    # of x**y can have either sign, so only integer exponents keep a finite enclosure.
+    negative = base_lo < 0
+    lo[negative], hi[negative] = -INF, INF
+    integer = (exponent_lo == exponent_hi) & (exponent_lo == np.round(exponent_lo))
+    for n in np.unique(exponent_lo[integer]):
+        points = integer & (exponent_lo == n)
+        lo[points], hi[points] = power_int(Interval(base_lo[points], base_hi[points]), int(n))
+    return Interval(lo, hi)
+
+
+def exp(value: Interval) -> Interval:
+    return increasing(np.exp, value)
+
+
+def log(value: Interval) -> Interval:
+    return increasing(np.log, value, 0.0)
+
+
+def _crosses(value: Interval, offset: float, period: float):
+    k = np.ceil((value.lo - offset) / period)
+    return offset + k * period <= value.hi
+
+
+def sin(value: Interval) -> Interval:
+    return _periodic(np.sin, value, math.pi / 2, -math.pi / 2)
+
+
+def cos(value: Interval) -> Interval:
+    return _periodic(np.cos, value, 0.0, math.pi)
+
+
+def _periodic(func: Callable, value: Interval, peak: float, trough: float) -> Interval:
+    full = value.hi - value.lo >= 2 * math.pi
+    at_lo, at_hi = func(value.lo), func(value.hi)
+    lo, hi = np.minimum(at_lo, at_hi), np.maximum(at_lo, at_hi)
+    hi = np.where(full | _crosses(value, peak, 2 * math.pi), 1.0, hi)
+    lo = np.where(full | _crosses(value, trough, 2 * math.pi), -1.0, lo)
+    return clip(widen(lo, hi), -1.0, 1.0)
+
+
+def tan(value: Interval) -> Interval:
+    pole = (value.hi - value.lo >= math.pi) | _crosses(value, math.pi / 2, math.pi)
+    result = widen(np.tan(value.lo), np.tan(value.hi))
+    return Interval(np.where(pole, -INF, result.lo), np.where(pole, INF, result.hi))
+
+
+def cot(value: Interval) -> Interval:
+    pole = (value.hi - value.lo >= math.pi) | _crosses(value, 0.0, math.pi)
+    result = widen(1 / np.tan(value.hi), 1 / np.tan(value.lo))
+    return Interval(np.where(pole, -INF, result.lo), np.where(pole, INF, result.hi))
+
+
+def arccot(value: Interval) -> Interval:
+    pole = (value.lo <= 0) & (value.hi >= 0)
+    result = widen(np.arctan(1 / value.hi), np.arctan(1 / value.lo))
+    return Interval(
+        np.where(pole, -math.pi / 2, result.lo), np.where(pole, math.pi / 2, result.hi)
+    )
+
+
+def reduce(value: Interval, shape: Tuple[int, ...]) -> Interval:
+    if not shape:
+        return value
+    return widen(ad.tensor._reduce(value.lo, shape), ad.tensor._reduce(value.hi, shape))
+
+
+def evaluate(op: ad.Base, boxes: Dict[str, Any] = {}, **kwargs) -> Interval:
+    if np is None:
+        raise ImportError("interval evaluation requires numpy")
+    boxes = {name: _box(value) for name, value in {**boxes, **kwargs}.items()}
+    op = ad.to_op(op)
+    values = {}
+    with np.errstate(all="ignore"):
+        for node in ad.cost.postorder(op):
+            operands = node.get_operands()
+            if operands:
+                values[id(node)] = node._interval_apply(*(values[id(o)] for o in operands))
+            else:
+                values[id(node)] = node._interval_call(boxes)
+    lo, hi = np.broadcast_arrays(*values[id(op)])
+    return Interval(np.array(lo, dtype=float), np.array(hi, dtype=float))
+
+
+__all__ = ["Interval"]
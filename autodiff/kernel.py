@@ -0,0 +1,174 @@
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import autodiff as ad
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class Kernel:
+    def __init__(self, op: ad.Base, optimize: bool = True, assume_positive: bool = False):
+        op = ad.to_op(op)
+        self.source = op
+        self.report: Optional[ad.PassReport] = None
+        if optimize:
+            op, self.report = ad.strength_reduce(op, assume_positive)
+        self.op = op
+        self.variables = sorted(var.var_name for var in self.source.get_variables())
+        self.shaped = [var for var in self.source.get_variables() if var.shape]
+
+        order = ad.cost.postorder(op)
+        classes = ad.cost.structure(order)
+        slots: Dict[int, int] = {}
+        self.program: List[Tuple[ad.Base, Optional[Tuple[int, ...]]]] = []
+        for node in order:
+            index = classes[id(node)]
+            if index in slots:
+                continue
+            operands = node.get_operands()
+            slots[index] = len(self.program)
+            if operands:
+                self.program.append(
+                    (node, tuple(slots[classes[id(operand)]] for operand in operands))
+                )
+            else:
+                self.program.append((node, None))
+
+        self._scalar = self._generate(array=False)
+        self._array = self._generate(array=True)
+        self._batched = None
+
+    def __len__(self) -> int:
+        return len(self.program)
+
+    def _expression(self, index: int, array: bool, namespace: dict, batched: bool = False) -> str:
+        node, operands = self.program[index]
+        args = [f"v{i}" for i in operands or ()]
+
+        if isinstance(node, ad.Variable):
+            namespace[f"n{index}"] = node.var_name
+            return f"vars[n{index}]" if array else f"complex(vars[n{index}])"
+        if isinstance(node, (ad.ComplexConst, ad.FloatConst, ad.IntConst, ad.Constant)):
+            namespace[f"n{index}"] = node._array_apply() if array else node.value
+            return f"n{index}"
+        if isinstance(node, ad.Polynomial):
+            values = []
+            for i, name in enumerate(node.variables):
+                namespace[f"n{index}_{i}"] = name
+                values.append(f"vars[n{index}_{i}]" if array else f"complex(vars[n{index}_{i}])")
+            namespace[f"n{index}"] = node._compile()
+            return f"n{index}({', '.join(values)})"
+        if operands is None:
+            namespace[f"n{index}"] = node._array_call if array else node._call
+            return f"n{index}(vars)"
+
+        if isinstance(node, ad.operators.Add):
+            return " + ".join(args) if args else "0"
+        if isinstance(node, ad.operators.Mul):
+            return " * ".join(args) if args else "1.0"
+        if isinstance(node, ad.operators.Neg):
+            return f"-{args[0]}"
+        if isinstance(node, ad.operators.Inv):
+            return f"1 / {args[0]}"
+        if isinstance(node, ad.operators.Pow):
+            return f"{args[0]} ** {args[1]}"
+        if isinstance(node, ad.Function):
+            namespace[f"n{index}"] = node._func_array_call if array else node._func_call
+        else:
+            namespace[f"n{index}"] = (
+                node._batch_apply if batched else node._array_apply if array else node._apply
+            )
+        return f"n{index}({', '.join(args)})"
+
+    def _generate(self, array: bool, batched: bool = False):
+        namespace = {}
+        lines = ["def kernel(vars):"]
+        for index in range(len(self.program)):
+            lines.append(f"    v{index} = {self._expression(index, array, namespace, batched)}")
+        lines.append(f"    return v{len(self.program) - 1}")
+        exec("\n".join(lines), namespace)
+        return namespace["kernel"]
+
+    def __call__(
+        self, vars: Dict[str, Union[complex, float, int]] = {}, **kwargs
+    ) -> complex:
+        vars = {**vars, **kwargs}
+        if self.shaped:
+            try:
+                result = self.array(ad.base._tensor_inputs(vars, self.shaped))
+            except ValueError:
+                return float("nan")
+            return complex(result) if result.ndim == 0 else result
+        try:
+            return complex(self._scalar(vars))
+        except (KeyError, ValueError, ArithmeticError):
+            return float("nan")
+
+    def array(self, vars: Dict[str, Sequence] = {}, **kwargs):
+        if np is None:
+            raise ImportError("Kernel.array requires numpy")
+        return self._run(self._array, {**vars, **kwargs})
+
+    def _run(self, kernel, vars: Dict[str, Sequence]):
+        vars = {name: np.asarray(value, dtype=complex) for name, value in vars.items()}
+        with np.errstate(all="ignore"):
+            try:
+                result = np.array(kernel(vars), dtype=complex)
+            except KeyError as error:
+                raise ValueError(f"unknown variable: {error.args[0]}")
+        result[~np.isfinite(result)] = float("nan")
+        return result
+
+    def batch(
+        self, records: Sequence, names: Optional[Sequence[str]] = None
+    ) -> List[complex]:
+        records = list(records)
+        if not records:
+            return []
+        if names is None:
+            names = self.variables
+        records = [
+            record if isinstance(record, dict) else dict(zip(names, record))
+            for record in records
+        ]
+        if np is not None:
+            try:
+                columns = {name: [record[name] for record in records] for name in names}
+            except KeyError:
+                pass
+            else:
+                if self.shaped:
+                    return self._tensor_batch(columns, len(records))
+                result = self.array(columns)
+                return np.broadcast_to(result, (len(records),)).tolist()
+        return [self(record) for record in records]
+
+    def _tensor_batch(self, columns: Dict[str, list], count: int) -> list:
+        shapes = {var.var_name: var.shape for var in self.shaped}
+        rank = max(len(shape) for shape in shapes.values())
+        if self._batched is None:
+            self._batched = self._generate(array=True, batched=True)
+        try:
+            stacked = {}
+            for name, column in columns.items():
+                shape = shapes.get(name, ())
+                values = np.stack([
+                    np.broadcast_to(np.asarray(value, dtype=complex), shape) for value in column
+                ])
+                stacked[name] = values.reshape((count,) + (1,) * (rank - len(shape)) + shape)
+            result = self._run(self._batched, stacked)
+        except ValueError:
+            return [self(dict(zip(columns, record))) for record in zip(*columns.values())]
+        shape = self.source.shape
+        result = np.broadcast_to(result, (count,) + (1,) * (rank - len(shape)) + shape)
+        result = result.reshape((count,) + shape)
+        return [complex(value) for value in result] if not shape else list(result)
+
+
+def compile(op: ad.Base, optimize: bool = True, assume_positive: bool = False) -> Kernel:
+    return Kernel(op, optimize, assume_positive)
+
+
+__all__ = ["compile", "Kernel"]
@@ -1,27 +1,57 @@
+import builtins
+import cmath
+import functools
+import numbers
+import operator
+
 import autodiff as ad
 
 
 class Neg(ad.Base):
     priority = 1
     name = "neg"
+    cost = 1
+
+    def __new__(cls, op: ad.Base):
+        op = ad.to_op(op)
+        if isinstance(op, Neg):
+            return op.op
+        if ad._is_const(op):
+            return ad.Const(-op.value)
+        return super().__new__(cls)
 
     def __init__(self, op: ad.Base):
         self.op = ad.to_op(op)
 
+    def __getnewargs__(self):
+        return (self.op,)
+
     def _call(self, vars):
         return -self.op._call(vars)
 
+    def _apply(self, value):
+        return -value
+
+    def _array_apply(self, value):
+        return -value
+
+    def _interval_apply(self, value):
+        return ad.interval.neg(value)
+
     def _derivative(self, var):
         return -self.op._derivative(var)
 
+    def _partials(self):
+        return [ad.IntConst(-1)]
+
+    def _local_partials(self, values, result):
+        return [-1]
+
     def get_operands(self):
         return [self.op]
 
     def get_variables(self):
-        return [self.op.get_variables()]
-
-    def copy(self):
-        return Neg(self.op.copy())
+        return self.op.get_variables()
 
     def __str__(self):
         if self.op.priority == -1:
@@ -34,24 +64,48 @@ class Neg(ad.Base):
 
 class Inv(ad.Base):
     name = "inv"
+    cost = 4
+
+    def __new__(cls, op: ad.Base):
+        op = ad.to_op(op)
+        if ad._is_const(op) and op.value in (1, -1):
+            return op
+        if isinstance(op, (ad.FloatConst, ad.ComplexConst)) and op.value != 0:
+            return ad.Const(1 / op.value)
+        return super().__new__(cls)
 
     def __init__(self, op: ad.Base):
         self.op = ad.to_op(op)
 
+    def __getnewargs__(self):
+        return (self.op,)
+
     def _call(self, vars):
         return 1 / self.op._call(vars)
 
+    def _apply(self, value):
+        return 1 / value
+
+    def _array_apply(self, value):
+        return 1 / value
+
+    def _interval_apply(self, value):
+        return ad.interval.inv(value)
+
     def _derivative(self, var):
         return -self.op._derivative(var) / self.op**2
 
+    def _partials(self):
+        return [-(self * self)]
+
+    def _local_partials(self, values, result):
+        return [-result * result]
+
     def get_operands(self):
         return [self.op]
 
     def get_variables(self):
-        return [self.op.get_variables()]
-
-    def copy(self):
-        return Inv(self.op.copy())
+        return self.op.get_variables()
 
     def __str__(self):
         if self.op.priority == -1:
@@ -65,18 +119,37 @@ class Inv(ad.Base):
 class Add(ad.Base):
     priority = 1
     name = "multiadd"
+    cost = 1
 
     def __init__(self, *args: ad.Base):
-        self.ops = list(map(ad.to_op, args))
+        self.ops = tuple(map(ad.to_op, args))
 
     def _call(self, vars):
         return sum(op._call(vars) for op in self.ops)
 
+    def _apply(self, *values):
+        return sum(values)
+
+    def _array_apply(self, *values):
+        return functools.reduce(operator.add, values, 0)
+
+    def _interval_apply(self, *values):
+        return ad.interval.add(*values)
+
+    def node_cost(self):
+        return self.cost * max(len(self.ops) - 1, 0)
+
     def _derivative(self, var):
-        return sum(op._derivative(var) for op in self.ops)
+        return add(*(op._derivative(var) for op in self.ops))
+
+    def _partials(self):
+        return [ad.IntConst(1)] * len(self.ops)
+
+    def _local_partials(self, values, result):
+        return [1] * len(values)
 
     def get_operands(self):
-        return self.ops.copy()
+        return list(self.ops)
 
     def get_variables(self):
         vars = set()
@@ -85,6 +158,8 @@ class Add(ad.Base):
         return vars
 
     def flatten(self):
+        if not any(_nested(op, Add, Neg) for op in self.ops):
+            return self
         ops = []
         for op in self.ops:
             if isinstance(op, Add):
@@ -95,9 +170,6 @@ class Add(ad.Base):
                 ops.append(op)
         return Add(*ops)
 
-    def copy(self):
-        return Add(*(op.copy() for op in self.ops))
-
     def __str__(self):
         if not self.ops:
             return "0"
@@ -124,9 +196,10 @@ class Add(ad.Base):
 class Mul(ad.Base):
     priority = 2
     name = "multimul"
+    cost = 1
 
     def __init__(self, *args: ad.Base):
-        self.ops = list(map(ad.to_op, args))
+        self.ops = tuple(map(ad.to_op, args))
 
     def _call(self, vars):
         res = 1.0
@@ -134,16 +207,55 @@ class Mul(ad.Base):
             res *= op._call(vars)
         return res
 
+    def _apply(self, *values):
+        return functools.reduce(operator.mul, values, 1.0)
+
+    def _array_apply(self, *values):
+        return functools.reduce(operator.mul, values, 1.0)
+
+    def _interval_apply(self, *values):
+        return ad.interval.mul(*values)
+
+    def node_cost(self):
+        return self.cost * max(len(self.ops) - 1, 0)
+
     def _derivative(self, var):
-        result = ad.Const(0)
-        for i in range(len(self.ops)):
-            result += Mul(*self.ops[:i], *self.ops[i + 1 :]) * self.ops[i]._derivative(
-                var
-            )
-        return result
+        terms = []
+        for i, op in enumerate(self.ops):
+            terms.append(mul(*self.ops[:i], *self.ops[i + 1 :], op._derivative(var)))
+        return add(*terms)
+
+    def _partials(self):
+        prefix = [None]
+        for op in self.ops[:-1]:
+            prefix.append(op if prefix[-1] is None else Mul(prefix[-1], op))
+        suffix = [None]
+        for op in reversed(self.ops[1:]):
+            suffix.append(op if suffix[-1] is None else Mul(op, suffix[-1]))
+        suffix.reverse()
+
+        partials = []
+        for before, after in zip(prefix, suffix):
+            if before is None and after is None:
+                partials.append(ad.IntConst(1))
+            elif before is None or after is None:
+                partials.append(after if before is None else before)
+            else:
+                partials.append(Mul(before, after))
+        return partials
+
+    def _local_partials(self, values, result):
+        prefix = [1.0]
+        for value in values[:-1]:
+            prefix.append(prefix[-1] * value)
+        suffix = [1.0]
+        for value in reversed(values[1:]):
+            suffix.append(value * suffix[-1])
+        suffix.reverse()
+        return [before * after for before, after in zip(prefix, suffix)]
 
     def get_operands(self):
-        return self.ops.copy()
+        return list(self.ops)
 
     def get_variables(self):
         vars = set()
@@ -152,6 +264,8 @@ class Mul(ad.Base):
         return vars
 
     def flatten(self):
+        if not any(_nested(op, Mul, Inv) for op in self.ops):
+            return self
         ops = []
         for op in self.ops:
             if isinstance(op, Mul):
@@ -162,9 +276,6 @@ class Mul(ad.Base):
                 ops.append(op)
         return Mul(*ops)
 
-    def copy(self):
-        return Mul(*(op.copy() for op in self.ops))
-
     def __str__(self):
         if not self.ops:
             return "1"
@@ -192,6 +303,7 @@ class Mul(ad.Base):
 class Pow(ad.Base):
     priority = 3
     name = "pow"
+    cost = 20
 
     def __init__(self, base, power):
         self.base = ad.to_op(base)
@@ -200,6 +312,18 @@ class Pow(ad.Base):
     def _call(self, vars):
         return self.base._call(vars) ** self.power._call(vars)
 
+    def _apply(self, base, power):
+        return base ** power
+
+    def _array_apply(self, base, power):
+        return base ** power
+
+    def _interval_apply(self, base, power):
+        exponent = getattr(self.power, "value", None)
+        if isinstance(exponent, numbers.Real) and float(exponent).is_integer():
+            return ad.interval.power_int(base, int(exponent))
+        return ad.interval.power(base, power)
+
     def _derivative(self, var):
         # (f(x)**g(x))' = f(x)**(g(x) - 1) * (g(x)*f'(x) + f(x)*ln(x)*g'(x))
 
@@ -208,15 +332,20 @@ class Pow(ad.Base):
         l22 = self.base * ad.ln(self.base) * self.power._derivative(var)
         return l1 * (l21 + l22)
 
+    def _partials(self):
+        return [self.power * self.base ** (self.power - 1), self * ad.ln(self.base)]
+
+    def _local_partials(self, values, result):
+        base, power = values
+        log = cmath.log(base) if base != 0 else 0
+        return [power * base ** (power - 1), result * log]
+
     def get_operands(self):
         return [self.base, self.power]
 
     def get_variables(self):
         return {*self.base.get_variables(), *self.power.get_variables()}
 
-    def copy(self):
-        return Pow(self.base.copy(), self.power.copy())
-
     def __str__(self):
         s1, s2 = str(self.base), str(self.power)
         if self.base.priority != -1:
@@ -229,3 +358,65 @@ class Pow(ad.Base):
         if not isinstance(other, Pow):
             return False
         return self.base == other.base and self.power == other.power
+
+
+def _nested(op: ad.Base, cls: type, wrapper: type) -> bool:
+    return isinstance(op, cls) or (isinstance(op, wrapper) and isinstance(op.op, cls))
+
+
+def _fold(cls: type, args, identity):
+    ops = []
+    constant, index = identity, None
+    for arg in map(ad.to_op, args):
+        for op in arg.ops if isinstance(arg, cls) else (arg,):
+            if not ad._is_const(op):
+                ops.append(op)
+                continue
+            if index is None:
+                index = len(ops)
+            constant = constant + op.value if cls is Add else constant * op.value
+    return ops, constant, index
+
+
+def add(*args: ad.Base) -> ad.Base:
+    ops, constant, index = _fold(Add, args, 0)
+    if not ops:
+        return ad.Const(constant)
+    if constant != 0:
+        ops.insert(index, ad.Const(constant))
+    return ops[0] if len(ops) == 1 else Add(*ops)
+
+
+def mul(*args: ad.Base) -> ad.Base:
+    ops, constant, index = _fold(Mul, args, 1)
+    if not ops or constant == 0:
+        return ad.Const(constant)
+    if constant != 1:
+        ops.insert(index, ad.Const(constant))
+    return ops[0] if len(ops) == 1 else Mul(*ops)
+
+
+def power(base: ad.Base, exponent: ad.Base) -> ad.Base:
+    base, exponent = ad.to_op(base), ad.to_op(exponent)
+    if ad._is_const(exponent):
+        if exponent.value == 0:
+            return ad.IntConst(1)
+        if exponent.value == 1:
+            return base
+    if ad._is_const(base):
+        if base.value == 1:
+            return ad.IntConst(1)
+        if ad._is_const(exponent) and not (
+            isinstance(exponent, ad.IntConst) and builtins.abs(exponent.value) > 64
+        ):
+            try:
+                return ad.Const(base.value ** exponent.value)
+            except (ArithmeticError, ValueError):
+                pass
+    if (
+        isinstance(base, Pow)
+        and isinstance(base.power, ad.IntConst)
+        and isinstance(exponent, ad.IntConst)
+    ):
+        return power(base.base, base.power.value * exponent.value)
+    return Pow(base, exponent)
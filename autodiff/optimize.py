@@ -0,0 +1,331 @@
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import autodiff as ad
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+METHODS = ("gradient", "bfgs", "newton")
+
+Point = Dict[str, Union[complex, float, int]]
+
+
+class RootResult(NamedTuple):
+    x: Union[complex, Dict[str, complex]]
+    residual: float
+    converged: bool
+    iterations: int
+    evaluations: int
+    jacobian_evaluations: int
+
+
+class MinimizeResult(NamedTuple):
+    x: Dict[str, float]
+    value: float
+    gradient_norm: float
+    converged: bool
+    iterations: int
+    evaluations: int
+    gradient_evaluations: int
+    hessian_evaluations: int
+
+
+class _Evaluator:
+    def __init__(self, ops: Tuple[ad.Base, ...], names: Tuple[str, ...]):
+        self.names = names
+        self.vars = [ad.Variable(name) for name in names]
+        self.values = [ad.compile(op) for op in ops]
+        self.gradients = [ad.gradient(op, self.vars) for op in ops]
+        self.jacobian = [[ad.compile(op) for op in row] for row in self.gradients]
+        self._hessian = None
+
+    @property
+    def hessian(self):
+        if self._hessian is None:
+            self._hessian = [
+                [ad.compile(op) for op in ad.gradient(gradient, self.vars)]
+                for gradient in self.gradients[0]
+            ]
+        return self._hessian
+
+    def _evaluate(self, kernels, points):
+        columns = {name: points[:, i] for i, name in enumerate(self.names)}
+        return np.stack(
+            [np.broadcast_to(kernel.array(columns), (len(points),)) for kernel in kernels],
+            axis=-1,
+        )
+
+    def value(self, points):
+        return self._evaluate(self.values, points)
+
+    def gradient(self, points):
+        rows = [self._evaluate(row, points) for row in self.jacobian]
+        return np.stack(rows, axis=1)
+
+    def hess(self, points):
+        rows = [self._evaluate(row, points) for row in self.hessian]
+        return np.stack(rows, axis=1)
+
+
+def _evaluator(ops: Tuple[ad.Base, ...], names: Tuple[str, ...]) -> _Evaluator:
+    return ad.cache.evaluators.get_or_compute(
+        (ops, names), lambda: _Evaluator(ops, names)
+    )
+
+
+def _names(ops: Sequence[ad.Base], vars) -> Tuple[str, ...]:
+    if vars is None:
+        variables = set()
+        for op in ops:
+            variables |= op.get_variables()
+        if not variables:
+            raise ValueError("the expressions have no variables; pass vars to name the ones to solve for")
+        return tuple(sorted(var.var_name for var in variables))
+    if not vars:
+        raise ValueError("vars must name at least one variable")
+    return tuple(ad.to_op(var).var_name for var in vars)
+
+
+def _points(x0, names: Tuple[str, ...], dtype):
+    single = isinstance(x0, dict)
+    records = [x0] if single else list(x0)
+    points = np.empty((len(records), len(names)), dtype=dtype)
+    for i, record in enumerate(records):
+        for j, name in enumerate(names):
+            if name not in record:
+                raise ValueError(f"no starting value for variable: {name}")
+            points[i, j] = record[name]
+    return points, single
+
+
+def _solve(matrix, rhs):
+    result = np.full(rhs.shape, np.nan, dtype=np.result_type(matrix, rhs))
+    finite = np.isfinite(matrix).all(axis=(1, 2)) & np.isfinite(rhs).all(axis=1)
+    if not finite.any():
+        return result
+    matrix, rhs = matrix[finite], rhs[finite]
+    try:
+        if matrix.shape[1] != matrix.shape[2]:
+            raise np.linalg.LinAlgError("not square")
+        result[finite] = np.linalg.solve(matrix, rhs[..., None])[..., 0]
+    except np.linalg.LinAlgError:
+        result[finite] = np.einsum("bij,bj->bi", np.linalg.pinv(matrix), rhs)
+    return result
+
+
+def _norm(values):
+    return np.linalg.norm(values, axis=-1)
+
+
+def root(
+    ops: Sequence[ad.Base],
+    x0: Union[Point, Sequence[Point]],
+    vars: Optional[Sequence[Union[ad.Variable, str]]] = None,
+    tol: float = 1e-12,
+    maxiter: int = 50,
+) -> Union[RootResult, List[RootResult]]:
+    if np is None:
+        raise ImportError("root requires numpy")
+    ops = tuple(ad.to_op(op) for op in ops)
+    names = _names(ops, vars)
+    evaluator = _evaluator(ops, names)
+    points, single = _points(x0, names, complex)
+
+    count = len(points)
+    active = np.ones(count, dtype=bool)
+    converged = np.zeros(count, dtype=bool)
+    iterations = np.zeros(count, dtype=int)
+    evaluations = np.ones(count, dtype=int)
+    jacobian_evaluations = np.zeros(count, dtype=int)
+
+    residuals = evaluator.value(points)
+    for _ in range(maxiter):
+        exact = active & (residuals == 0).all(axis=1)
+        converged |= exact
+        active &= ~exact & np.isfinite(residuals).all(axis=1)
+        index = np.flatnonzero(active)
+        if not len(index):
+            break
+
+        jacobian = evaluator.gradient(points[index])
+        jacobian_evaluations[index] += 1
+        step = _solve(jacobian, -residuals[index])
+        points[index] += step
+        iterations[index] += 1
+        residuals[index] = evaluator.value(points[index])
+        evaluations[index] += 1
+
+        finite = np.isfinite(step).all(axis=1) & np.isfinite(residuals[index]).all(axis=1)
+        length = _norm(step)
+        small = length <= tol * (1 + _norm(points[index]))
+        converged[index[small & finite & (length > 0)]] = True
+        active[index[small | ~finite]] = False
+
+    results = []
+    for i in range(count):
+        x = dict(zip(names, points[i].tolist()))
+        results.append(RootResult(
+            x=x,
+            residual=float(_norm(residuals[i])),
+            converged=bool(converged[i]),
+            iterations=int(iterations[i]),
+            evaluations=int(evaluations[i]),
+            jacobian_evaluations=int(jacobian_evaluations[i]),
+        ))
+    return results[0] if single else results
+
+
+def newton(
+    op: ad.Base,
+    x0: Union[complex, float, int, Sequence[Union[complex, float, int]]],
+    var: Optional[Union[ad.Variable, str]] = None,
+    tol: float = 1e-12,
+    maxiter: int = 50,
+) -> Union[RootResult, List[RootResult]]:
+    op = ad.to_op(op)
+    if var is None:
+        variables = op.get_variables()
+        if len(variables) != 1:
+            raise ValueError(f"newton needs exactly one variable, not {len(variables)}")
+        var = variables.pop()
+    name = ad.to_op(var).var_name
+
+    single = not isinstance(x0, (list, tuple)) and not (
+        np is not None and isinstance(x0, np.ndarray)
+    )
+    starts = [{name: value} for value in ([x0] if single else x0)]
+    results = [
+        result._replace(x=result.x[name])
+        for result in root([op], starts, [name], tol, maxiter)
+    ]
+    return results[0] if single else results
+
+
+def _direction(method, gradient, inverse, hessian):
+    if method == "gradient":
+        return -gradient
+    if method == "bfgs":
+        return -np.einsum("bij,bj->bi", inverse, gradient)
+    direction = _solve(hessian, -gradient)
+    descent = np.isfinite(direction).all(axis=1) & (
+        np.einsum("bi,bi->b", direction, gradient) < 0
+    )
+    return np.where(descent[:, None], direction, -gradient)
+
+
+def minimize(
+    op: ad.Base,
+    x0: Union[Point, Sequence[Point]],
+    vars: Optional[Sequence[Union[ad.Variable, str]]] = None,
+    method: str = "bfgs",
+    tol: float = 1e-8,
+    maxiter: int = 200,
+) -> Union[MinimizeResult, List[MinimizeResult]]:
+    if np is None:
+        raise ImportError("minimize requires numpy")
+    if method not in METHODS:
+        raise ValueError(f"unknown minimization method: {method}")
+    op = ad.to_op(op)
+    names = _names([op], vars)
+    evaluator = _evaluator((op,), names)
+    points, single = _points(x0, names, float)
+
+    count, size = points.shape
+    active = np.ones(count, dtype=bool)
+    converged = np.zeros(count, dtype=bool)
+    iterations = np.zeros(count, dtype=int)
+    evaluations = np.ones(count, dtype=int)
+    gradient_evaluations = np.ones(count, dtype=int)
+    hessian_evaluations = np.zeros(count, dtype=int)
+
+    values = ad._to_float_array(evaluator.value(points)[:, 0])
+    gradients = ad._to_float_array(evaluator.gradient(points)[:, 0])
+    inverse = np.broadcast_to(np.eye(size), (count, size, size)).copy()
+    for _ in range(maxiter):
+        norms = np.abs(gradients).max(axis=1, initial=0.0)
+        done = active & (norms <= tol)
+        converged |= done
+        active &= ~done & np.isfinite(values) & np.isfinite(norms)
+        index = np.flatnonzero(active)
+        if not len(index):
+            break
+
+        hessian = None
+        if method == "newton":
+            hessian = ad._to_float_array(evaluator.hess(points[index]))
+            hessian_evaluations[index] += 1
+        direction = _direction(method, gradients[index], inverse[index], hessian)
+        if method != "newton":
+            first = iterations[index] == 0
+            direction[first] /= np.maximum(_norm(direction[first]), 1.0)[:, None]
+        slope = np.einsum("bi,bi->b", direction, gradients[index])
+
+        step = np.ones(len(index))
+        trial_values = np.full(len(index), np.inf)
+        pending = np.ones(len(index), dtype=bool)
+        for _ in range(60):
+            rows = np.flatnonzero(pending)
+            if not len(rows):
+                break
+            trial = points[index[rows]] + step[rows, None] * direction[rows]
+            trial_values[rows] = ad._to_float_array(evaluator.value(trial)[:, 0])
+            evaluations[index[rows]] += 1
+            accepted = trial_values[rows] <= (
+                values[index[rows]] + 1e-4 * step[rows] * slope[rows]
+            )
+            pending[rows[accepted]] = False
+            step[rows[~accepted]] /= 2
+
+        moved = ~pending
+        active[index[~moved]] = False
+        index, direction, step = index[moved], direction[moved], step[moved]
+        if not len(index):
+            continue
+
+        shift = step[:, None] * direction
+        points[index] += shift
+        iterations[index] += 1
+        new_gradients = ad._to_float_array(evaluator.gradient(points[index])[:, 0])
+        gradient_evaluations[index] += 1
+        change = new_gradients - gradients[index]
+        values[index] = trial_values[moved]
+        gradients[index] = new_gradients
+
+        if method == "bfgs":
+            curvature = np.einsum("bi,bi->b", shift, change)
+            update = curvature > 1e-12 * _norm(shift) * _norm(change)
+            first = update & (iterations[index] == 1)
+            scale = curvature[first] / np.einsum("bi,bi->b", change[first], change[first])
+            inverse[index[first]] = scale[:, None, None] * np.eye(size)
+            rows = index[update]
+            rho = 1 / curvature[update]
+            s, y = shift[update], change[update]
+            left = np.eye(size) - rho[:, None, None] * np.einsum("bi,bj->bij", s, y)
+            inverse[rows] = np.einsum("bij,bjk,blk->bil", left, inverse[rows], left) + (
+                rho[:, None, None] * np.einsum("bi,bj->bij", s, s)
+            )
+
+        stalled = _norm(shift) <= np.finfo(float).eps * (1 + _norm(points[index]))
+        active[index[stalled]] = False
+
+    norms = np.abs(gradients).max(axis=1, initial=0.0)
+    converged |= norms <= tol
+    results = []
+    for i in range(count):
+        results.append(MinimizeResult(
+            x=dict(zip(names, points[i].tolist())),
+            value=float(values[i]),
+            gradient_norm=float(norms[i]),
+            converged=bool(converged[i]),
+            iterations=int(iterations[i]),
+            evaluations=int(evaluations[i]),
+            gradient_evaluations=int(gradient_evaluations[i]),
+            hessian_evaluations=int(hessian_evaluations[i]),
+        ))
+    return results[0] if single else results
+
+
+__all__ = ["newton", "root", "minimize", "RootResult", "MinimizeResult"]
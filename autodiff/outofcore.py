@@ -0,0 +1,94 @@
+from typing import Dict, NamedTuple, Optional, Union
+import os
+import time
+
+import autodiff as ad
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+
+class OutOfCoreReport(NamedTuple):
+    rows: int
+    blocks: int
+    seconds: float
+    rows_per_second: float
+
+
+def _open_columns(op: ad.Base, columns: Union[PathLike, Dict[str, PathLike]]):
+    names = sorted(var.var_name for var in op.get_variables())
+    if not isinstance(columns, dict):
+        columns = {name: os.path.join(columns, f"{name}.npy") for name in names}
+
+    arrays = {}
+    for name in names:
+        if name not in columns:
+            raise ValueError(f"no column for variable: {name}")
+        arrays[name] = np.load(columns[name], mmap_mode="r")
+
+    lengths = {len(array) for array in arrays.values()}
+    if not names:
+        if not columns:
+            raise ValueError("expression has no variables; pass columns to set the row count")
+        lengths = {len(np.load(path, mmap_mode="r")) for path in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError(f"columns have different lengths: {sorted(lengths)}")
+    return arrays, lengths.pop()
+
+
+def _open_output(path: PathLike, rows: int, dtype):
+    return np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=(rows,))
+
+
+def _store(out, index: slice, values):
+    if np.issubdtype(out.dtype, np.complexfloating):
+        out[index] = values
+    else:
+        out[index] = ad._to_float_array(values)
+
+
+def evaluate_columns(
+    op: ad.Base,
+    columns: Union[PathLike, Dict[str, PathLike]],
+    out: PathLike,
+    gradient: Optional[Dict[str, PathLike]] = None,
+    block_size: int = 65536,
+    dtype=complex,
+) -> OutOfCoreReport:
+    if np is None:
+        raise ImportError("evaluate_columns requires numpy")
+    if block_size < 1:
+        raise ValueError(f"block_size must be positive, not {block_size}")
+
+    start = time.perf_counter()
+    arrays, rows = _open_columns(op, columns)
+
+    targets = [(ad.compile(op), _open_output(out, rows, dtype))]
+    variables = {var.var_name: var for var in op.get_variables()}
+    for name, path in (gradient or {}).items():
+        derivative = op.derivative(variables.get(name, ad.Variable(name)))
+        targets.append((ad.compile(derivative), _open_output(path, rows, dtype)))
+
+    blocks = 0
+    for begin in range(0, rows, block_size):
+        index = slice(begin, min(begin + block_size, rows))
+        block = {name: array[index] for name, array in arrays.items()}
+        for kernel, output in targets:
+            values = kernel.array(block)
+            _store(output, index, np.broadcast_to(values, (index.stop - begin,)))
+        blocks += 1
+
+    for _, output in targets:
+        output.flush()
+
+    seconds = time.perf_counter() - start
+    rows_per_second = rows / seconds if seconds > 0 else float("inf")
+    return OutOfCoreReport(rows, blocks, seconds, rows_per_second)
+
+
+__all__ = ["evaluate_columns", "OutOfCoreReport"]
@@ -0,0 +1,207 @@
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import autodiff as ad
+from autodiff.operators import Add, Inv, Mul, Neg, Pow
+from autodiff.trigonometry import CosPart, SinCos, SinPart
+
+
+class PassReport(NamedTuple):
+    rules: Dict[str, Dict[str, int]]
+    cost_before: int
+    cost_after: int
+
+    @property
+    def saved(self) -> int:
+        return self.cost_before - self.cost_after
+
+    def as_dict(self):
+        return {
+            "rules": {name: dict(stats) for name, stats in self.rules.items()},
+            "cost_before": self.cost_before,
+            "cost_after": self.cost_after,
+            "saved": self.saved,
+        }
+
+
+def _is_positive(op: ad.Base, assume_positive: bool) -> bool:
+    if isinstance(op, (ad.IntConst, ad.FloatConst, ad.Constant)):
+        return op.value > 0
+    if isinstance(op, ad.Variable):
+        return assume_positive
+    if isinstance(op, ad.exp):
+        return _is_real(op.op, assume_positive)
+    if isinstance(op, (ad.sqrt, ad.rsqrt, Inv)):
+        return _is_positive(op.op, assume_positive)
+    if isinstance(op, (Add, Mul)):
+        return all(_is_positive(operand, assume_positive) for operand in op.ops)
+    if isinstance(op, Pow):
+        return _is_positive(op.base, assume_positive) and _is_real(
+            op.power, assume_positive
+        )
+    return False
+
+
+def _is_real(op: ad.Base, assume_positive: bool) -> bool:
+    if isinstance(op, (ad.IntConst, ad.FloatConst, ad.Constant)):
+        return True
+    if _is_positive(op, assume_positive):
+        return True
+    if isinstance(op, (Neg, Inv, ad.exp, ad.sin, ad.cos, ad.arctg, SinPart, CosPart)):
+        operand = op.pair.op if isinstance(op, (SinPart, CosPart)) else op.op
+        return _is_real(operand, assume_positive)
+    if isinstance(op, (Add, Mul)):
+        return all(_is_real(operand, assume_positive) for operand in op.ops)
+    return False
+
+
+_NUMBERS = (ad.IntConst, ad.FloatConst, ad.ComplexConst)
+
+
+def _polynomial_classes(order, classes: Dict[int, int]) -> set:
+    polynomial = set()
+    for op in order:
+        operands = op.get_operands()
+        if isinstance(op, ad.Variable):
+            is_polynomial = not op.shape
+        elif isinstance(op, (*_NUMBERS, ad.Polynomial)):
+            is_polynomial = True
+        elif isinstance(op, (Neg, Add, Mul)):
+            is_polynomial = all(classes[id(operand)] in polynomial for operand in operands)
+        elif isinstance(op, Inv):
+            is_polynomial = isinstance(op.op, _NUMBERS)
+        elif isinstance(op, Pow):
+            is_polynomial = (
+                classes[id(op.base)] in polynomial
+                and isinstance(op.power, ad.IntConst)
+                and op.power.value >= 0
+            )
+        else:
+            is_polynomial = False
+        if is_polynomial:
+            polynomial.add(classes[id(op)])
+    return polynomial
+
+
+class _StrengthReducer:
+    def __init__(self, assume_positive: bool, max_power: int, polynomials: bool = True):
+        self.assume_positive = assume_positive
+        self.max_power = max_power
+        self.polynomials = polynomials
+        self.rules: Dict[str, Dict[str, int]] = {}
+        self.pairs: Dict[int, SinCos] = {}
+        self.fused: set = set()
+
+    def hit(self, rule: str, before: int, after: int):
+        stats = self.rules.setdefault(rule, {"hits": 0, "flops_before": 0, "flops_after": 0})
+        stats["hits"] += 1
+        stats["flops_before"] += before
+        stats["flops_after"] += after
+
+    def power_chain(self, base: ad.Base, n: int) -> Tuple[ad.Base, int]:
+        squares = [base]
+        while 2 ** len(squares) <= n:
+            squares.append(Mul(squares[-1], squares[-1]))
+        factors = [squares[k] for k in range(len(squares)) if n >> k & 1]
+        multiplications = len(squares) - 1 + len(factors) - 1
+        if len(factors) == 1:
+            return factors[0], multiplications
+        return Mul(*reversed(factors)), multiplications
+
+    def positive(self, op: ad.Base) -> bool:
+        return _is_positive(op, self.assume_positive)
+
+    def rewrite(self, op: ad.Base, operand_class: Optional[int]) -> ad.Base:
+        if isinstance(op, Neg) and isinstance(op.op, Neg):
+            self.hit("neg_neg", 2 * Neg.cost, 0)
+            return op.op.op
+
+        if isinstance(op, Inv) and isinstance(op.op, Inv) and self.positive(op.op.op):
+            self.hit("inv_inv", 2 * Inv.cost, 0)
+            return op.op.op
+
+        if isinstance(op, Inv) and isinstance(op.op, ad.sqrt):
+            self.hit("rsqrt", Inv.cost + ad.sqrt.cost, ad.rsqrt.cost)
+            return ad.rsqrt(op.op.op)
+        if isinstance(op, ad.sqrt) and isinstance(op.op, Inv):
+            self.hit("rsqrt", Inv.cost + ad.sqrt.cost, ad.rsqrt.cost)
+            return ad.rsqrt(op.op.op)
+
+        if isinstance(op, ad.exp) and isinstance(op.op, ad.ln) and self.positive(op.op.op):
+            self.hit("exp_ln", ad.exp.cost + ad.ln.cost, 0)
+            return op.op.op
+        if (
+            isinstance(op, ad.ln)
+            and isinstance(op.op, ad.exp)
+            and _is_real(op.op.op, self.assume_positive)
+        ):
+            self.hit("ln_exp", ad.exp.cost + ad.ln.cost, 0)
+            return op.op.op
+
+        if isinstance(op, Pow) and isinstance(op.power, ad.IntConst):
+            n = op.power.value
+            if n == 2 and isinstance(op.base, ad.sqrt) and self.positive(op.base.op):
+                self.hit("sqrt_square", Pow.cost + ad.sqrt.cost, 0)
+                return op.base.op
+            if 2 <= abs(n) <= self.max_power:
+                result, multiplications = self.power_chain(op.base, abs(n))
+                if n < 0:
+                    self.hit("int_pow", Pow.cost, multiplications * Mul.cost + Inv.cost)
+                    return Inv(result)
+                self.hit("int_pow", Pow.cost, multiplications * Mul.cost)
+                return result
+
+        if isinstance(op, (ad.sin, ad.cos)) and operand_class in self.fused:
+            pair = self.pairs.get(operand_class)
+            if pair is None:
+                pair = self.pairs[operand_class] = SinCos(op.op)
+                self.hit("sincos", ad.sin.cost + ad.cos.cost, SinCos.cost)
+            return SinPart(pair) if isinstance(op, ad.sin) else CosPart(pair)
+
+        return op
+
+    def to_polynomial(self, op: ad.Base) -> ad.Base:
+        poly = ad.Polynomial.from_expr(op)
+        if poly is None:
+            return op
+        before, after = ad.metrics(op).dag_cost, poly.node_cost()
+        if after >= before:
+            return op
+        self.hit("polynomial", before, after)
+        return poly
+
+    def __call__(self, root: ad.Base) -> ad.Base:
+        order = ad.cost.postorder(root)
+        classes = ad.cost.structure(order)
+
+        sin_args = {classes[id(op.op)] for op in order if isinstance(op, ad.sin)}
+        cos_args = {classes[id(op.op)] for op in order if isinstance(op, ad.cos)}
+        self.fused = sin_args & cos_args
+        polynomial = _polynomial_classes(order, classes) if self.polynomials else set()
+
+        new: Dict[int, ad.Base] = {}
+        for op in order:
+            index = classes[id(op)]
+            if index in new:
+                continue
+            operands = op.get_operands()
+            if operands:
+                op = op.with_operands(*(new[classes[id(operand)]] for operand in operands))
+            operand_class = classes[id(operands[0])] if len(operands) == 1 else None
+            new[index] = self.rewrite(op, operand_class)
+            if index in polynomial and isinstance(new[index], Add):
+                new[index] = self.to_polynomial(new[index])
+        return new[classes[id(root)]]
+
+
+def strength_reduce(
+    op: ad.Base, assume_positive: bool = False, max_power: int = 64, polynomials: bool = True
+) -> Tuple[ad.Base, PassReport]:
+    reducer = _StrengthReducer(assume_positive, max_power, polynomials)
+    result = reducer(ad.to_op(op))
+    report = PassReport(
+        reducer.rules, ad.metrics(op).dag_cost, ad.metrics(result).dag_cost
+    )
+    return result, report
+
+
+__all__ = ["strength_reduce", "PassReport"]
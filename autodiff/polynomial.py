@@ -0,0 +1,397 @@
+from __future__ import annotations
+from fractions import Fraction
+from numbers import Number
+from typing import Dict, Optional, Sequence, Tuple, Union
+import itertools
+import operator
+
+import autodiff as ad
+
+
+Coefficient = Union[int, Fraction, float, complex]
+Monomial = Tuple[int, ...]
+
+
+def _normalize(coefficient: Coefficient) -> Coefficient:
+    if isinstance(coefficient, Fraction) and coefficient.denominator == 1:
+        return coefficient.numerator
+    return coefficient
+
+
+class Polynomial(ad.Base):
+    priority = 1
+    name = "polynomial"
+
+    def __init__(
+        self,
+        variables: Sequence[Union[ad.Variable, str]],
+        terms: Dict[Monomial, Coefficient],
+    ):
+        self.variables = tuple(sorted({ad.to_op(var).var_name for var in variables}))
+        if list(self.variables) != [ad.to_op(var).var_name for var in variables]:
+            raise ValueError("polynomial variables must be sorted and unique")
+        self.terms: Dict[Monomial, Coefficient] = {}
+        for monomial, coefficient in terms.items():
+            if len(monomial) != len(self.variables):
+                raise ValueError(f"monomial {monomial} does not match {self.variables}")
+            if coefficient != 0:
+                self.terms[tuple(monomial)] = _normalize(coefficient)
+        self._scheme = None
+
+    @classmethod
+    def constant(cls, value: Coefficient, variables: Sequence[str] = ()) -> Polynomial:
+        return cls(variables, {(0,) * len(variables): value})
+
+    @classmethod
+    def from_expr(cls, op: ad.Base) -> Optional[Polynomial]:
+        if isinstance(op, Polynomial):
+            return op
+        op = ad.to_op(op)
+        try:
+            return _convert(op, _variables(op))
+        except _NotPolynomial:
+            return None
+
+    def to_expr(self) -> ad.Base:
+        terms = []
+        for monomial, coefficient in sorted(self.terms.items(), key=_term_order):
+            negative = not isinstance(coefficient, complex) and coefficient < 0
+            if negative:
+                coefficient = -coefficient
+
+            factors = []
+            for name, power in zip(self.variables, monomial):
+                if power == 1:
+                    factors.append(ad.Variable(name))
+                elif power:
+                    factors.append(ad.Variable(name) ** power)
+            if isinstance(coefficient, Fraction):
+                if coefficient.numerator != 1 or not factors:
+                    factors.insert(0, ad.IntConst(coefficient.numerator))
+                factors.append(ad.operators.Inv(ad.IntConst(coefficient.denominator)))
+            elif coefficient != 1 or not factors:
+                factors.insert(0, ad.Const(coefficient))
+
+            term = factors[0] if len(factors) == 1 else ad.operators.Mul(*factors)
+            terms.append(ad.operators.Neg(term) if negative else term)
+
+        if not terms:
+            return ad.IntConst(0)
+        if len(terms) == 1:
+            return terms[0]
+        return ad.operators.Add(*terms)
+
+    def degree(self) -> int:
+        return max((sum(monomial) for monomial in self.terms), default=0)
+
+    def _extend(self, variables: Tuple[str, ...]) -> Dict[Monomial, Coefficient]:
+        if variables == self.variables:
+            return self.terms
+        index = [variables.index(name) for name in self.variables]
+        terms = {}
+        for monomial, coefficient in self.terms.items():
+            extended = [0] * len(variables)
+            for i, power in zip(index, monomial):
+                extended[i] = power
+            terms[tuple(extended)] = coefficient
+        return terms
+
+    def _coerce(self, other) -> Optional[Polynomial]:
+        if isinstance(other, Polynomial):
+            return other
+        if isinstance(other, Number):
+            return Polynomial.constant(other) # type: ignore
+        if isinstance(other, ad.Base):
+            return Polynomial.from_expr(other)
+        return None
+
+    def _combine(self, other: Polynomial, combine) -> Polynomial:
+        variables = tuple(sorted({*self.variables, *other.variables}))
+        return combine(variables, self._extend(variables), other._extend(variables))
+
+    @staticmethod
+    def _add(variables, terms1, terms2) -> Polynomial:
+        terms = dict(terms1)
+        for monomial, coefficient in terms2.items():
+            terms[monomial] = terms.get(monomial, 0) + coefficient
+        return Polynomial(variables, terms)
+
+    @staticmethod
+    def _mul(variables, terms1, terms2) -> Polynomial:
+        terms: Dict[Monomial, Coefficient] = {}
+        for monomial1, coefficient1 in terms1.items():
+            for monomial2, coefficient2 in terms2.items():
+                monomial = tuple(map(operator.add, monomial1, monomial2))
+                terms[monomial] = terms.get(monomial, 0) + coefficient1 * coefficient2
+        return Polynomial(variables, terms)
+
+    def __neg__(self):
+        return Polynomial(self.variables, {m: -c for m, c in self.terms.items()})
+
+    def __add__(self, other):
+        poly = self._coerce(other)
+        if poly is None:
+            return super().__add__(other)
+        return self._combine(poly, self._add)
+
+    def __radd__(self, other):
+        poly = self._coerce(other)
+        if poly is None:
+            return super().__radd__(other)
+        return poly._combine(self, self._add)
+
+    def __sub__(self, other):
+        poly = self._coerce(other)
+        if poly is None:
+            return super().__sub__(other)
+        return self._combine(-poly, self._add)
+
+    def __rsub__(self, other):
+        poly = self._coerce(other)
+        if poly is None:
+            return super().__rsub__(other)
+        return poly._combine(-self, self._add)
+
+    def __mul__(self, other):
+        poly = self._coerce(other)
+        if poly is None:
+            return super().__mul__(other)
+        return self._combine(poly, self._mul)
+
+    def __rmul__(self, other):
+        poly = self._coerce(other)
+        if poly is None:
+            return super().__rmul__(other)
+        return poly._combine(self, self._mul)
+
+    def __pow__(self, other):
+        if isinstance(other, ad.IntConst):
+            other = other.value
+        if not isinstance(other, int) or isinstance(other, bool) or other < 0:
+            return super().__pow__(other)
+        result = Polynomial.constant(1, self.variables)
+        base = self
+        while other:
+            if other & 1:
+                result = result * base
+            other >>= 1
+            if other:
+                base = base * base
+        return result
+
+    def _horner(self):
+        if self._scheme is None:
+            object.__setattr__(self, "_scheme", _horner_scheme(list(self.terms.items()), 0))
+        return self._scheme
+
+    def _evaluate(self, values):
+        return _horner_evaluate(self._horner(), values)
+
+    def _compile(self):
+        return _horner_function(self._horner(), len(self.variables))
+
+    def _call(self, vars):
+        values = []
+        for name in self.variables:
+            try:
+                values.append(complex(vars[name]))
+            except KeyError:
+                raise ValueError(f"unknown variable: {name}")
+        return complex(self._evaluate(values))
+
+    def _array_call(self, vars):
+        values = []
+        for name in self.variables:
+            try:
+                values.append(vars[name])
+            except KeyError:
+                raise ValueError(f"unknown variable: {name}")
+        return self._evaluate(values)
+
+    def _interval_call(self, boxes):
+        return self.to_expr()._interval_call(boxes)
+
+    def _derivative(self, var):
+        if var.var_name not in self.variables:
+            return Polynomial(self.variables, {})
+        index = self.variables.index(var.var_name)
+        terms: Dict[Monomial, Coefficient] = {}
+        for monomial, coefficient in self.terms.items():
+            power = monomial[index]
+            if power:
+                derived = monomial[:index] + (power - 1,) + monomial[index + 1 :]
+                terms[derived] = coefficient * power
+        return Polynomial(self.variables, terms)
+
+    def node_cost(self):
+        return 2 * _horner_operations(self._horner())
+
+    def get_operands(self):
+        return []
+
+    def get_variables(self):
+        used = {i for monomial in self.terms for i, power in enumerate(monomial) if power}
+        return {ad.Variable(self.variables[i]) for i in used}
+
+    def __str__(self):
+        return str(self.to_expr())
+
+    def __eq__(self, other):
+        if not isinstance(other, Polynomial):
+            return False
+        variables = tuple(sorted({*self.variables, *other.variables}))
+        return self._extend(variables) == other._extend(variables)
+
+    def __hash__(self):
+        terms = []
+        for monomial, coefficient in self.terms.items():
+            powers = zip(self.variables, monomial)
+            terms.append((tuple(pair for pair in powers if pair[1]), coefficient))
+        return hash(frozenset(terms))
+
+
+class _NotPolynomial(Exception):
+    pass
+
+
+def _term_order(term: Tuple[Monomial, Coefficient]):
+    monomial, _ = term
+    return -sum(monomial), tuple(-power for power in monomial)
+
+
+def _constant_value(op: ad.Base) -> Optional[Coefficient]:
+    if isinstance(op, ad.IntConst):
+        return op.value
+    if isinstance(op, (ad.FloatConst, ad.ComplexConst)):
+        return op.value
+    return None
+
+
+def _variables(op: ad.Base) -> Tuple[str, ...]:
+    names = {var.var_name for var in op.get_variables()}
+    for node in ad.cost.postorder(op):
+        if isinstance(node, Polynomial):
+            names.update(node.variables)
+    return tuple(sorted(names))
+
+
+def _convert(op: ad.Base, variables: Tuple[str, ...]) -> Polynomial:
+    if isinstance(op, Polynomial):
+        return Polynomial(variables, op._extend(variables))
+    if isinstance(op, ad.Variable):
+        monomial = tuple(int(name == op.var_name) for name in variables)
+        return Polynomial(variables, {monomial: 1})
+
+    value = _constant_value(op)
+    if value is not None:
+        return Polynomial.constant(value, variables)
+
+    if isinstance(op, ad.operators.Neg):
+        return -_convert(op.op, variables)
+    if isinstance(op, ad.operators.Inv):
+        value = _constant_value(op.op)
+        if value is None or value == 0:
+            raise _NotPolynomial
+        if isinstance(value, int):
+            return Polynomial.constant(Fraction(1, value), variables)
+        return Polynomial.constant(1 / value, variables)
+    if isinstance(op, ad.operators.Add):
+        result = Polynomial.constant(0, variables)
+        for operand in op.get_operands():
+            result = result + _convert(operand, variables)
+        return result
+    if isinstance(op, ad.operators.Mul):
+        result = Polynomial.constant(1, variables)
+        for operand in op.get_operands():
+            result = result * _convert(operand, variables)
+        return result
+    if isinstance(op, ad.operators.Pow):
+        power = op.power
+        if isinstance(power, ad.IntConst) and power.value >= 0:
+            return _convert(op.base, variables) ** power.value
+    raise _NotPolynomial
+
+
+def _horner_scheme(terms, index: int):
+    if not terms:
+        return 0
+    if index == len(terms[0][0]):
+        return sum(coefficient for _, coefficient in terms)
+
+    groups: Dict[int, list] = {}
+    for monomial, coefficient in terms:
+        groups.setdefault(monomial[index], []).append((monomial, coefficient))
+    if len(groups) == 1 and 0 in groups:
+        return _horner_scheme(terms, index + 1)
+
+    return index, [
+        (power, _horner_scheme(groups[power], index + 1))
+        for power in sorted(groups, reverse=True)
+    ]
+
+
+def _horner_evaluate(scheme, values):
+    if not isinstance(scheme, tuple):
+        return scheme
+    index, groups = scheme
+    x = values[index]
+    result = 0
+    previous = groups[0][0]
+    for power, inner in groups:
+        if previous - power == 1:
+            result = result * x
+        elif previous != power:
+            result = result * x ** (previous - power)
+        result = result + _horner_evaluate(inner, values)
+        previous = power
+    if previous:
+        result = result * x**previous
+    return result
+
+
+def _horner_function(scheme, count: int):
+    namespace: Dict[str, Coefficient] = {}
+    lines = [f"def horner({', '.join(f'x{i}' for i in range(count))}):"]
+    temporaries = itertools.count()
+
+    def emit(scheme) -> str:
+        if not isinstance(scheme, tuple):
+            name = f"c{len(namespace)}"
+            namespace[name] = scheme
+            return name
+        index, groups = scheme
+        result = f"t{next(temporaries)}"
+        previous = None
+        for power, inner in groups:
+            term = emit(inner)
+            if previous is None:
+                lines.append(f"    {result} = {term}")
+            else:
+                lines.append(f"    {result} = {result} * {_power(index, previous - power)} + {term}")
+            previous = power
+        if previous:
+            lines.append(f"    {result} = {result} * {_power(index, previous)}")
+        return result
+
+    lines.append(f"    return {emit(scheme)}")
+    exec("\n".join(lines), namespace)
+    return namespace["horner"]
+
+
+def _power(index: int, power: int) -> str:
+    return f"x{index}" if power == 1 else f"x{index} ** {power}"
+
+
+def _horner_operations(scheme) -> int:
+    if not isinstance(scheme, tuple):
+        return 0
+    _, groups = scheme
+    return len(groups) + sum(_horner_operations(inner) for _, inner in groups)
+
+
+def polynomial(op: ad.Base) -> ad.Base:
+    poly = Polynomial.from_expr(op)
+    return op if poly is None else poly
+
+
+__all__ = ["Polynomial", "polynomial"]
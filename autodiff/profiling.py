@@ -0,0 +1,195 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import functools
+import json
+import threading
+import time
+
+import autodiff as ad
+
+
+NODE_METHODS = ("_call", "_derivative")
+
+
+def _subclasses(cls: type) -> List[type]:
+    result, stack = [], [cls]
+    while stack:
+        cls = stack.pop()
+        result.append(cls)
+        stack.extend(cls.__subclasses__())
+    return result
+
+
+class Profile:
+    _active: Optional["Profile"] = None
+
+    def __init__(self):
+        self.nodes: Dict[str, Dict[str, Dict[str, float]]] = {}
+        self.rules: Dict[str, Dict[str, float]] = {}
+        self.simplifier: Dict[str, float] = {
+            "calls": 0,
+            "iterations": 0,
+            "max_iterations": 0,
+            "time": 0.0,
+            "nodes_before": 0,
+            "nodes_after": 0,
+            "max_nodes_before": 0,
+        }
+        self._patched: List[Tuple[type, str, Any]] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @property
+    def _state(self) -> threading.local:
+        state = self._local
+        if not hasattr(state, "children"):
+            state.children = []
+            state.depth = 0
+            state.iterations = 0
+        return state
+
+    def _timed(self, func: Callable, stats: Dict[str, float], *args, **kwargs):
+        children = self._state.children
+        children.append(0.0)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            own = elapsed - children.pop()
+            if children:
+                children[-1] += elapsed
+            with self._lock:
+                stats["calls"] += 1
+                stats["time"] += elapsed
+                stats["self_time"] += own
+
+    def _node_stats(self, node: ad.Base, method: str) -> Dict[str, float]:
+        with self._lock:
+            methods = self.nodes.setdefault(type(node).__name__, {})
+            if method not in methods:
+                methods[method] = {"calls": 0, "time": 0.0, "self_time": 0.0}
+            return methods[method]
+
+    def _rule_stats(self, name: str) -> Dict[str, float]:
+        with self._lock:
+            if name not in self.rules:
+                self.rules[name] = {"calls": 0, "hits": 0, "time": 0.0, "self_time": 0.0}
+            return self.rules[name]
+
+    def _wrap_node(self, method: str, func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(node, *args, **kwargs):
+            stats = self._node_stats(node, method)
+            return self._timed(func, stats, node, *args, **kwargs)
+        return wrapper
+
+    def _wrap_get_method(self, func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(simplifier, name):
+            rule = func(simplifier, name)
+            if rule is None:
+                return None
+
+            @functools.wraps(rule)
+            def timed_rule(*args):
+                stats = self._rule_stats(name)
+                result = self._timed(rule, stats, *args)
+                if result is not None:
+                    with self._lock:
+                        stats["hits"] += 1
+                return result
+            return timed_rule
+        return wrapper
+
+    def _wrap_simplify(self, func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(simplifier, op):
+            state = self._state
+            if state.depth == 0:
+                state.iterations += 1
+            state.depth += 1
+            try:
+                return func(simplifier, op)
+            finally:
+                state.depth -= 1
+        return wrapper
+
+    def _wrap_fixed_point(self, func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(simplifier, op, *args, **kwargs):
+            stats, state = self.simplifier, self._state
+            outer = state.depth, state.iterations
+            state.depth, state.iterations = 0, 0
+            before = len(ad.cost.postorder(op))
+            start = time.perf_counter()
+            try:
+                result = func(simplifier, op, *args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                with self._lock:
+                    stats["time"] += elapsed
+                    stats["calls"] += 1
+                    stats["iterations"] += state.iterations
+                    stats["max_iterations"] = max(stats["max_iterations"], state.iterations)
+                state.depth, state.iterations = outer
+            after = len(ad.cost.postorder(result))
+            with self._lock:
+                stats["nodes_before"] += before
+                stats["nodes_after"] += after
+                stats["max_nodes_before"] = max(stats["max_nodes_before"], before)
+            return result
+        return wrapper
+
+    def _patch(self, cls: type, name: str, wrapper: Callable):
+        original = cls.__dict__[name]
+        self._patched.append((cls, name, original))
+        setattr(cls, name, wrapper)
+
+    def __enter__(self) -> "Profile":
+        if Profile._active is not None:
+            raise RuntimeError("a profile is already active")
+        Profile._active = self
+
+        for cls in _subclasses(ad.Base):
+            for method in NODE_METHODS:
+                if method in cls.__dict__:
+                    self._patch(cls, method, self._wrap_node(method, cls.__dict__[method]))
+
+        for cls in _subclasses(ad.simplify.Simplifier):
+            if "__call__" in cls.__dict__:
+                self._patch(cls, "__call__", self._wrap_fixed_point(cls.__dict__["__call__"]))
+            if "simplify" in cls.__dict__:
+                self._patch(cls, "simplify", self._wrap_simplify(cls.__dict__["simplify"]))
+            if "get_method" in cls.__dict__:
+                self._patch(cls, "get_method", self._wrap_get_method(cls.__dict__["get_method"]))
+        return self
+
+    def __exit__(self, *exc_info):
+        for cls, name, original in reversed(self._patched):
+            setattr(cls, name, original)
+        self._patched.clear()
+        Profile._active = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "nodes": {
+                name: {method: dict(stats) for method, stats in methods.items()}
+                for name, methods in self.nodes.items()
+            },
+            "rules": {name: dict(stats) for name, stats in self.rules.items()},
+            "simplifier": dict(self.simplifier),
+        }
+
+    def to_json(self, path: Optional[str] = None, indent: int = 2) -> str:
+        report = json.dumps(self.as_dict(), indent=indent, sort_keys=True)
+        if path is not None:
+            with open(path, "w") as file:
+                file.write(report)
+        return report
+
+
+def profile() -> Profile:
+    return Profile()
+
+
+__all__ = ["profile", "Profile"]
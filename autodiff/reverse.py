@@ -0,0 +1,493 @@
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Set, Tuple, Union
+import math
+import sys
+
+import autodiff as ad
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+VALUE_SIZE = sys.getsizeof(0j)
+
+STRATEGIES = ("all", "uniform", "sqrt", "cost")
+
+
+def _scale(adjoint: ad.Base, partial: ad.Base) -> ad.Base:
+    if partial == 1:
+        return adjoint
+    if adjoint == 1:
+        return partial
+    if partial == -1:
+        return ad.operators.Neg(adjoint)
+    return ad.operators.Mul(adjoint, partial)
+
+
+def _reduce_to(term: ad.Base, operand: ad.Base) -> ad.Base:
+    shape = operand.shape
+    if term.shape == shape:
+        return term
+    if not shape:
+        return ad.tensor.Sum(term)
+    if ad.base._broadcast_shapes(term.shape, shape) == shape:
+        return term
+    return ad.tensor.SumTo(term, operand)
+
+
+def _dependencies(order: List[ad.Base], names: set) -> Dict[int, bool]:
+    depends: Dict[int, bool] = {}
+    for op in order:
+        operands = op.get_operands()
+        if isinstance(op, ad.Variable):
+            depends[id(op)] = op.var_name in names
+        elif operands:
+            depends[id(op)] = any(depends[id(operand)] for operand in operands)
+        else:
+            depends[id(op)] = any(var.var_name in names for var in op.get_variables())
+    return depends
+
+
+def gradient(
+    op: ad.Base, vars: Sequence[Union[ad.Variable, str]]
+) -> List[ad.Base]:
+    op = ad.to_op(op)
+    vars = [ad.to_op(var) for var in vars]
+    for var in vars:
+        if not isinstance(var, ad.Variable):
+            raise TypeError(f"var must be Variable, not {type(var)}")
+    names = {var.var_name for var in vars}
+    shaped = bool(op._shaped_variables())
+    if op.shape:
+        raise ValueError(f"gradient needs a scalar expression, not one of shape {op.shape}")
+
+    order = ad.cost.postorder(op)
+    depends = _dependencies(order, names)
+
+    pending: Dict[int, List[ad.Base]] = {id(op): [ad.IntConst(1)]}
+    results: Dict[str, List[ad.Base]] = {name: [] for name in names}
+    for node in reversed(order):
+        if not depends[id(node)]:
+            continue
+        terms = pending.pop(id(node))
+        adjoint = terms[0] if len(terms) == 1 else ad.operators.Add(*terms)
+
+        if isinstance(node, ad.Variable):
+            results[node.var_name].append(adjoint)
+            continue
+
+        operands = node.get_operands()
+        try:
+            partials = node._partials() if operands else None
+        except NotImplementedError:
+            partials = None
+        if partials is None:
+            for var in vars:
+                results[var.var_name].append(_scale(adjoint, node._derivative(var)))
+            continue
+
+        for operand, partial in zip(operands, partials):
+            if depends[id(operand)] and partial != 0:
+                term = _scale(adjoint, partial)
+                if shaped:
+                    term = _reduce_to(term, operand)
+                pending.setdefault(id(operand), []).append(term)
+
+    gradients = []
+    for var in vars:
+        terms = results[var.var_name]
+        if not terms:
+            result = ad.IntConst(0)
+        elif len(terms) == 1:
+            result = terms[0]
+        else:
+            result = ad.operators.Add(*terms)
+        if var.shape and result.shape != var.shape:
+            result = ad.tensor.SumTo(result, var)
+        gradients.append(result)
+    return gradients
+
+
+class ReverseReport(NamedTuple):
+    strategy: str
+    nodes: int
+    checkpoints: int
+    budget: Optional[int]
+    peak_values: int
+    peak_bytes: int
+    evaluations: int
+    recomputations: int
+
+    @property
+    def overhead(self) -> float:
+        return self.recomputations / self.evaluations if self.evaluations else 0.0
+
+
+class GradientResult(NamedTuple):
+    value: complex
+    gradient: List[complex]
+    report: ReverseReport
+
+
+def _checkpoints(
+    program, strategy: str, slots: Optional[int]
+) -> Set[int]:
+    inner = [i for i, (_, operands) in enumerate(program) if operands is not None]
+    if slots is not None and slots >= len(inner):
+        return set(inner)
+    if slots is not None and slots <= 0:
+        return set()
+    if strategy == "all":
+        if slots is None:
+            return set(inner)
+        strategy = "uniform"
+
+    if strategy == "cost":
+        fanout = [0] * len(program)
+        for _, operands in program:
+            for i in operands or ():
+                fanout[i] += 1
+        ranked = sorted(
+            inner, key=lambda i: program[i][0].node_cost() * fanout[i], reverse=True
+        )
+        count = slots if slots is not None else math.isqrt(len(inner)) + 1
+        return set(ranked[:count])
+
+    if strategy == "sqrt":
+        step = math.isqrt(len(inner)) or 1
+        if slots is not None and slots < 2 * step:
+            step = math.ceil(len(inner) / slots)
+    else:
+        step = math.ceil(len(inner) / slots) if slots else 1
+    return set(inner[step - 1 :: step])
+
+
+def _last_uses(program) -> List[int]:
+    last_use = list(range(len(program)))
+    for i, (_, operands) in enumerate(program):
+        for j in operands or ():
+            last_use[j] = i
+    return last_use
+
+
+def _working_set(program, last_use: List[int]) -> int:
+    live = peak = arity = 0
+    for i, (_, operands) in enumerate(program):
+        live += 1 - sum(last_use[j] == i for j in set(operands or ()))
+        peak = max(peak, live)
+        arity = max(arity, len(operands or ()))
+    return peak + arity + 1
+
+
+class _Sweep:
+    def __init__(
+        self, program, vars, checkpoints: Set[int], slots: Optional[int], working: int
+    ):
+        self.program = program
+        self.vars = vars
+        self.checkpoints = checkpoints
+        self.slots = slots
+        self.working = working
+        self.last_use = _last_uses(program)
+        self.stored: Dict[int, complex] = {}
+        self.cache: Dict[int, complex] = {}
+        self.evaluations = 0
+        self.recomputations = 0
+        self.peak = 0
+
+    def track(self, extra: int = 0):
+        self.peak = max(self.peak, len(self.stored) + len(self.cache) + extra)
+
+    def forward(self) -> complex:
+        live: Dict[int, complex] = {}
+        for i, (node, operands) in enumerate(self.program):
+            if operands is None:
+                value = node._call(self.vars)
+            else:
+                value = node._apply(*[live[j] for j in operands])
+                self.evaluations += 1
+            live[i] = value
+            if i in self.checkpoints:
+                self.stored[i] = value
+            for j in set(operands or ()):
+                if self.last_use[j] == i:
+                    del live[j]
+            self.track(sum(j not in self.stored for j in live))
+        return value
+
+    def available(self, index: int) -> bool:
+        return index in self.stored or index in self.cache
+
+    def get(self, index: int, live: Dict[int, complex]) -> complex:
+        if index in self.stored:
+            return self.stored[index]
+        if index in self.cache:
+            return self.cache[index]
+        return live[index]
+
+    def recompute(self, targets: Set[int]):
+        needed: Set[int] = set()
+        stack = [i for i in targets if not self.available(i)]
+        while stack:
+            i = stack.pop()
+            if i in needed:
+                continue
+            needed.add(i)
+            stack.extend(j for j in self.program[i][1] or () if not self.available(j))
+
+        order = sorted(needed)
+        last_use = {}
+        for i in order:
+            for j in self.program[i][1] or ():
+                last_use[j] = i
+
+        live: Dict[int, complex] = {}
+        for i in order:
+            node, operands = self.program[i]
+            if operands is None:
+                value = node._call(self.vars)
+            else:
+                value = node._apply(*[self.get(j, live) for j in operands])
+                self.recomputations += 1
+            for j in set(operands or ()):
+                if j in live and last_use[j] == i:
+                    del live[j]
+            if i in targets:
+                self.cache[i] = value
+            else:
+                live[i] = value
+            self.track(len(live))
+
+    def value(self, index: int) -> complex:
+        if not self.available(index):
+            self.recompute({index})
+        return self.get(index, {})
+
+    def backward(self) -> Dict[int, complex]:
+        adjoints: Dict[int, complex] = {len(self.program) - 1: 1}
+        boundaries = sorted(self.checkpoints | {0})
+        end = len(self.program)
+        for start in reversed(boundaries):
+            steps = [i for i in range(end - 1, start - 1, -1) if self.program[i][1] is not None]
+            segment = {j for i in steps for j in (i, *self.program[i][1])} - set(self.stored)
+            whole = self.slots is None or (
+                len(self.stored) + len(segment) + self.working <= self.slots
+            )
+            if whole:
+                self.recompute(segment)
+            for i in steps:
+                if i not in adjoints:
+                    continue
+                operands = self.program[i][1]
+                if not whole:
+                    self.recompute({i, *operands})
+                adjoint = adjoints.pop(i)
+                values = [self.value(j) for j in operands]
+                partials = self.program[i][0]._local_partials(values, self.value(i))
+                for j, partial in zip(operands, partials):
+                    adjoints[j] = adjoints.get(j, 0) + adjoint * partial
+                if not whole:
+                    self.cache.clear()
+            self.cache.clear()
+            end = start
+        return adjoints
+
+
+def evaluate_gradient(
+    op: ad.Base,
+    values: Dict[str, Union[complex, float, int]],
+    vars: Optional[Sequence[Union[ad.Variable, str]]] = None,
+    budget: Optional[int] = None,
+    strategy: str = "sqrt",
+) -> GradientResult:
+    if strategy not in STRATEGIES:
+        raise ValueError(f"unknown checkpoint strategy: {strategy}")
+    op = ad.to_op(op)
+    if vars is None:
+        vars = sorted(op.get_variables(), key=lambda var: var.var_name)
+    names = [ad.to_op(var).var_name for var in vars]
+
+    if op._shaped_variables():
+        raise ValueError("evaluate_gradient needs scalar variables; use gradient() for shaped ones")
+
+    program = ad.compile(op, optimize=False).program
+    working = _working_set(program, _last_uses(program))
+    slots = None if budget is None else budget // VALUE_SIZE
+    if slots is not None and slots < working:
+        raise ValueError(
+            f"a budget of {budget} bytes is too small for this expression; "
+            f"it needs at least {working * VALUE_SIZE} bytes"
+        )
+    checkpoints = _checkpoints(program, strategy, None if slots is None else slots - working)
+    sweep = _Sweep(program, dict(values), checkpoints, slots, working)
+
+    try:
+        value = complex(sweep.forward())
+        adjoints = sweep.backward()
+    except (ValueError, ArithmeticError):
+        value, adjoints = float("nan"), None
+
+    gradient = []
+    for name in names:
+        if adjoints is None:
+            gradient.append(float("nan"))
+            continue
+        total = 0j
+        for i, (node, operands) in enumerate(program):
+            if i not in adjoints or operands is not None:
+                continue
+            if isinstance(node, ad.Variable):
+                if node.var_name == name:
+                    total += adjoints[i]
+            else:
+                var = next((var for var in node.get_variables() if var.var_name == name), None)
+                if var is None:
+                    continue
+                derivative = node._derivative(var)
+                total += adjoints[i] * derivative._call(sweep.vars)
+        gradient.append(total)
+
+    report = ReverseReport(
+        strategy=strategy,
+        nodes=len(program),
+        checkpoints=len(sweep.checkpoints),
+        budget=budget,
+        peak_values=sweep.peak,
+        peak_bytes=sweep.peak * VALUE_SIZE,
+        evaluations=sweep.evaluations,
+        recomputations=sweep.recomputations,
+    )
+    return GradientResult(value, gradient, report)
+
+
+class _TangentProgram(NamedTuple):
+    program: List[Tuple[ad.Base, Optional[Tuple[int, ...]]]]
+    outputs: List[int]
+
+
+def _tangent_program(op: ad.Base, names: Tuple[str, ...]) -> _TangentProgram:
+    return ad.cache.tangent_programs.get_or_compute(
+        (op, names), lambda: _build_tangent_program(op, names)
+    )
+
+
+def _build_tangent_program(op: ad.Base, names: Tuple[str, ...]) -> _TangentProgram:
+    program, slots, outputs = [], {}, []
+    for output in gradient(op, names):
+        for node in ad.cost.postorder(output):
+            if id(node) in slots:
+                continue
+            operands = node.get_operands()
+            slots[id(node)] = len(program)
+            program.append((node, tuple(slots[id(o)] for o in operands) if operands else None))
+        outputs.append(slots[id(output)])
+    return _TangentProgram(program, outputs)
+
+
+def _leaf_tangent(node: ad.Base, vars, directions: Dict[str, Any]):
+    if isinstance(node, ad.Variable):
+        return directions.get(node.var_name)
+    tangent = None
+    for var in node.get_variables():
+        if var.var_name in directions:
+            term = node._derivative(var)._call(vars) * directions[var.var_name]
+            tangent = term if tangent is None else tangent + term
+    return tangent
+
+
+def _tangents(program: _TangentProgram, vars, directions: Dict[str, Any]) -> list:
+    values: List[complex] = []
+    tangents: List[Any] = []
+    for node, operands in program.program:
+        if operands is None:
+            values.append(node._call(vars))
+            tangents.append(_leaf_tangent(node, vars, directions))
+            continue
+
+        args = [values[i] for i in operands]
+        value = node._apply(*args)
+        values.append(value)
+        if all(tangents[i] is None for i in operands):
+            tangents.append(None)
+            continue
+        try:
+            partials = node._local_partials(args, value)
+        except NotImplementedError:
+            tangents.append(_leaf_tangent(node, vars, directions))
+            continue
+        tangent = None
+        for i, partial in zip(operands, partials):
+            if tangents[i] is not None:
+                term = partial * tangents[i]
+                tangent = term if tangent is None else tangent + term
+        tangents.append(tangent)
+    return [tangents[i] for i in program.outputs]
+
+
+def _names(op: ad.Base, vars) -> List[str]:
+    if op._shaped_variables():
+        raise ValueError("Hessian-vector products need scalar variables")
+    if vars is None:
+        vars = sorted(op.get_variables(), key=lambda var: var.var_name)
+    return [ad.to_op(var).var_name for var in vars]
+
+
+def _direction(vector, names: List[str]) -> List[complex]:
+    if isinstance(vector, dict):
+        return [complex(vector.get(name, 0)) for name in names]
+    vector = [complex(value) for value in vector]
+    if len(vector) != len(names):
+        raise ValueError(f"vector has {len(vector)} components for {len(names)} variables")
+    return vector
+
+
+def hessian_vector_product(
+    op: ad.Base,
+    values: Dict[str, Union[complex, float, int]],
+    vector,
+    vars: Optional[Sequence[Union[ad.Variable, str]]] = None,
+) -> List[complex]:
+    op = ad.to_op(op)
+    names = _names(op, vars)
+    directions = dict(zip(names, _direction(vector, names)))
+    try:
+        tangents = _tangents(_tangent_program(op, tuple(names)), dict(values), directions)
+    except (ValueError, ArithmeticError):
+        return [float("nan")] * len(names)
+    return [0j if tangent is None else complex(tangent) for tangent in tangents]
+
+
+def batch_hessian_vector_product(
+    op: ad.Base,
+    values: Dict[str, Union[complex, float, int]],
+    vectors,
+    vars: Optional[Sequence[Union[ad.Variable, str]]] = None,
+):
+    if np is None:
+        raise ImportError("batch_hessian_vector_product requires numpy")
+    op = ad.to_op(op)
+    names = _names(op, vars)
+    matrix = np.array([_direction(vector, names) for vector in vectors], dtype=complex)
+    matrix = matrix.reshape(-1, len(names))
+    directions = dict(zip(names, matrix.T))
+    result = np.zeros(matrix.shape, dtype=complex)
+    try:
+        with np.errstate(all="ignore"):
+            tangents = _tangents(_tangent_program(op, tuple(names)), dict(values), directions)
+    except (ValueError, ArithmeticError):
+        return np.full(matrix.shape, float("nan"), dtype=complex)
+    for i, tangent in enumerate(tangents):
+        if tangent is not None:
+            result[:, i] = tangent
+    return result
+
+
+__all__ = [
+    "gradient",
+    "evaluate_gradient",
+    "hessian_vector_product",
+    "batch_hessian_vector_product",
+    "GradientResult",
+    "ReverseReport",
+]
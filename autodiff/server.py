@@ -0,0 +1,193 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+import asyncio
+import bisect
+import json
+import math
+import os
+import time
+
+import autodiff as ad
+
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+LATENCY_BOUNDS = tuple(10.0 ** (k / 2) for k in range(-12, 1))
+
+
+class Histogram:
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "bounds": list(self.bounds),
+            "counts": list(self.counts),
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.mean,
+            "max": self.max,
+        }
+
+
+class _Queue:
+    def __init__(self, kernel: ad.Kernel):
+        self.kernel = kernel
+        self.pending: List[Tuple[Dict, asyncio.Future, float]] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class EvaluationServer:
+    def __init__(self, window: float = 0.001, max_batch: int = 1024):
+        if window < 0:
+            raise ValueError(f"window must not be negative, not {window}")
+        if max_batch < 1:
+            raise ValueError(f"max_batch must be positive, not {max_batch}")
+        self.window = window
+        self.max_batch = max_batch
+        self._queues: Dict[str, _Queue] = {}
+        self.requests = 0
+        self.batches = 0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.batch_size = Histogram([2 ** k for k in range(max_batch.bit_length())])
+        self.latency = Histogram(LATENCY_BOUNDS)
+
+    def register(self, name: str, op: ad.Base, optimize: bool = True):
+        self._queues[name] = _Queue(ad.compile(op, optimize))
+
+    def unregister(self, name: str):
+        queue = self._queues.pop(name)
+        self._flush(queue)
+
+    @property
+    def expressions(self) -> List[str]:
+        return sorted(self._queues)
+
+    async def evaluate(
+        self, name: str, vars: Dict[str, Union[complex, float, int]] = {}, **kwargs
+    ) -> complex:
+        try:
+            queue = self._queues[name]
+        except KeyError:
+            raise ValueError(f"unknown expression: {name}")
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        queue.pending.append(({**vars, **kwargs}, future, time.perf_counter()))
+        self.requests += 1
+        self.queue_depth += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+
+        if len(queue.pending) >= self.max_batch:
+            self._flush(queue)
+        elif queue.timer is None:
+            queue.timer = loop.call_later(self.window, self._flush, queue)
+        return await future
+
+    def _flush(self, queue: _Queue):
+        if queue.timer is not None:
+            queue.timer.cancel()
+            queue.timer = None
+        pending, queue.pending = queue.pending, []
+        if not pending:
+            return
+        self.queue_depth -= len(pending)
+        self.batches += 1
+        self.batch_size.observe(len(pending))
+
+        try:
+            values = queue.kernel.batch([record for record, _, _ in pending])
+        except Exception:
+            values = [self._evaluate_one(queue.kernel, record) for record, _, _ in pending]
+
+        now = time.perf_counter()
+        for (_, future, start), value in zip(pending, values):
+            if not future.done():
+                if isinstance(value, Exception):
+                    future.set_exception(value)
+                else:
+                    future.set_result(value)
+            self.latency.observe(now - start)
+
+    @staticmethod
+    def _evaluate_one(kernel: ad.Kernel, record: Dict) -> Union[complex, Exception]:
+        try:
+            return kernel(record)
+        except Exception as error:
+            return error
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "expressions": self.expressions,
+            "requests": self.requests,
+            "batches": self.batches,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "batch_size": self.batch_size.as_dict(),
+            "latency": self.latency.as_dict(),
+        }
+
+    async def serve_unix(self, path: PathLike) -> asyncio.AbstractServer:
+        return await asyncio.start_unix_server(self._handle, path=path)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        tasks = set()
+        try:
+            async for line in reader:
+                if not line.strip():
+                    continue
+                task = asyncio.ensure_future(self._respond(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+
+    async def _respond(self, line: bytes, writer: asyncio.StreamWriter):
+        response: Dict[str, Any] = {}
+        try:
+            request = json.loads(line)
+            response["id"] = request.get("id")
+            command = request.get("op", "evaluate")
+            if command == "evaluate":
+                value = await self.evaluate(request["name"], _decode(request.get("values", {})))
+                response["value"] = _encode(value)
+            elif command == "stats":
+                response["stats"] = self.stats()
+            else:
+                raise ValueError(f"unknown op: {command}")
+        except Exception as error:
+            response["error"] = f"{type(error).__name__}: {error}"
+        writer.write(json.dumps(response).encode() + b"\n")
+        await writer.drain()
+
+
+def _decode(values: Dict[str, Any]) -> Dict[str, Union[complex, float, int]]:
+    return {
+        name: complex(*value) if isinstance(value, list) else value
+        for name, value in values.items()
+    }
+
+
+def _encode(value: complex) -> Optional[List[float]]:
+    value = complex(value)
+    if not (math.isfinite(value.real) and math.isfinite(value.imag)):
+        return None
+    return [value.real, value.imag]
+
+
+__all__ = ["EvaluationServer"]
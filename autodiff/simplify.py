@@ -1,38 +1,75 @@
-from typing import List, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import collections
+import itertools
 import math
+import threading
 
 import autodiff as ad
 
 
 class Singleton(type):
     _instances = {}
+    _lock = threading.Lock()
 
     def __call__(cls, *args, **kwargs):
-        if cls not in cls._instances:
-            cls._instances[cls] = super(Singleton, cls).__call__(*args, **kwargs)
+        try:
+            return cls._instances[cls]
+        except KeyError:
+            pass
+        with cls._lock:
+            if cls not in cls._instances:
+                cls._instances[cls] = super(Singleton, cls).__call__(*args, **kwargs)
         return cls._instances[cls]
 
 
 class Simplifier(metaclass=Singleton):
-    def __call__(self, op: ad.Base) -> ad.Base:
+    def __call__(
+        self, op: ad.Base, workers: Optional[int] = None, threshold: int = 2048
+    ) -> ad.Base:
+        if workers is not None and workers > 1:
+            return self.parallel(op, workers, threshold)
         while True:
             new_op = self.simplify(op)
-            if new_op == op:
+            if new_op is op or new_op == op:
                 return op
             op = new_op
-            
-    
+
+    def parallel(self, op: ad.Base, workers: int, threshold: int = 2048) -> ad.Base:
+        with ProcessPoolExecutor(workers) as pool:
+            while True:
+                chunks = _partition(op, threshold, workers)
+                futures = [pool.submit(_simplify_chunk, type(self), chunk) for chunk in chunks]
+                done: Dict[int, ad.Base] = {}
+                for chunk, future in zip(chunks, futures):
+                    for node, result in zip(chunk, future.result()):
+                        done[id(node)] = result
+                new_op = self.combine(op, done)
+                if new_op is op or new_op == op:
+                    return op
+                op = new_op
+
+    def combine(self, op: ad.Base, done: Dict[int, ad.Base]) -> ad.Base:
+        if id(op) in done:
+            return done[id(op)]
+        ops = op.get_operands()
+        if ops:
+            op = op.with_operands(*(self.combine(operand, done) for operand in ops))
+        return self.rewrite(op)
+
     def simplify(self, op):
         ops = op.get_operands()
         if ops:
-            for i in range(len(ops)):
-                ops[i] = self.simplify(ops[i])
-            op = type(op)(*ops)
+            op = op.with_operands(*(self.simplify(operand) for operand in ops))
+        return self.rewrite(op)
+
+    def rewrite(self, op):
+        ops = op.get_operands()
         method = self.get_method(op.name)
         if method is None:
             return op
         new_op = method(*ops)
-        if new_op is None:
+        if new_op is None or new_op == op:
             return op
         return new_op
 
@@ -212,6 +249,14 @@ class BaseSimp(Simplifier):
             return 1 / (op1 ** ad._abs(op2))
         if isinstance(op1, ad.operators.Pow):
             return op1.base ** (op1.power * op2)
+        if isinstance(op1, ad.operators.Mul) and isinstance(op2, ad.IntConst):
+            ops = op1.get_operands()
+            if any(ad._is_const(op) or isinstance(op, ad.operators.Pow) for op in ops):
+                return ad.operators.mul(*(op**op2 for op in ops))
+
+    def inv(self, op):
+        if isinstance(op, ad.operators.Mul):
+            return ad.operators.Mul(*map(ad.operators.Inv, op.get_operands()))
 
     def multiadd(self, *ops):
         powers = []
@@ -232,8 +277,43 @@ class BaseSimp(Simplifier):
                 powers.append(power_.value if isinstance(power_, (ad.FloatConst, ad.IntConst)) else 0)
         
         ops = [b for a, b in sorted(zip(powers, ops), key=lambda el:-el[0])]
-        return super(BaseSimp, self).multiadd(*ops)
-    
+        op = super(BaseSimp, self).multiadd(*ops)
+        if isinstance(op, ad.operators.Add):
+            factored = self.factor(op.get_operands())
+            if factored is not None:
+                return factored
+        return op
+
+    def factor(self, ops):
+        return self._factor([(op, _factors(op)) for op in ops])
+
+    def _factor(self, terms):
+        counts = collections.Counter(
+            itertools.chain.from_iterable(dict.fromkeys(factors) for _, factors in terms)
+        )
+        common = max(counts, key=counts.get, default=None)
+        if common is None or counts[common] < 2:
+            return None
+
+        inner, outer = [], []
+        for op, factors in terms:
+            if common not in factors:
+                outer.append((op, factors))
+                continue
+            operands = ad._abs(op).get_operands()
+            operands.remove(common)
+            term = operands[0] if len(operands) == 1 else ad.operators.Mul(*operands)
+            term = -term if ad._is_neg(op) else term
+            inner.append((term, _factors(term)))
+
+        product = self._factor(inner)
+        if product is None:
+            product = ad.operators.add(*(op for op, _ in inner))
+        rest = self._factor(outer)
+        if rest is None:
+            return ad.operators.add(common * product, *(op for op, _ in outer))
+        return ad.operators.add(common * product, rest)
+
     def multimul(self, *ops):
         ops = list(ops)
         index = None
@@ -259,7 +339,74 @@ class BaseSimp(Simplifier):
             if index:
                 del ops[index]
                 return ad.operators.Mul(*ops) + power_
-           
+
+    def sum(self, op):
+        if not op.shape:
+            return op
+
+    def dot(self, op1, op2):
+        if op1 == 0 or op2 == 0:
+            return ad.IntConst(0)
+
+
+_NUMBERS = (ad.IntConst, ad.FloatConst, ad.ComplexConst)
+
+
+def _tree_sizes(op: ad.Base) -> Dict[int, int]:
+    sizes: Dict[int, int] = {}
+    for node in ad.cost.postorder(op):
+        sizes[id(node)] = 1 + sum(sizes[id(operand)] for operand in node.get_operands())
+    return sizes
+
+
+def _partition(op: ad.Base, threshold: int, workers: int) -> List[List[ad.Base]]:
+    sizes = _tree_sizes(op)
+    if sizes[id(op)] <= threshold:
+        return []
+
+    frontier, seen, stack = [], set(), [op]
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        if sizes[id(node)] > threshold:
+            stack.extend(reversed(node.get_operands()))
+        elif node.get_operands():
+            frontier.append(node)
+
+    capacity = min(threshold, max(sizes[id(op)] // (4 * workers), 1))
+    chunks, chunk, size = [], [], 0
+    for node in frontier:
+        chunk.append(node)
+        size += sizes[id(node)]
+        if size >= capacity:
+            chunks.append(chunk)
+            chunk, size = [], 0
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def _simplify_chunk(cls: type, ops: List[ad.Base]) -> List[ad.Base]:
+    simplifier = cls()
+    return [simplifier.simplify(op) for op in ops]
+
+
+def _factors(op: ad.Base) -> List[ad.Base]:
+    if isinstance(op, ad.operators.Neg):
+        op = op.op
+    if not isinstance(op, ad.operators.Mul):
+        return []
+    return [factor for factor in op.ops if not _is_monomial(factor)]
+
+
+def _is_monomial(op: ad.Base) -> bool:
+    if isinstance(op, ad.operators.Pow):
+        return isinstance(op.base, ad.Variable) and isinstance(op.power, _NUMBERS)
+    return isinstance(op, (ad.Variable, *_NUMBERS))
+
+
 def _get_power(op: ad.Base) -> Tuple[ad.Base, ad.Base]:
     if isinstance(op, ad.operators.Pow):
         return op.base, op.power
@@ -0,0 +1,208 @@
+from typing import Tuple
+import math
+
+import autodiff as ad
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _reduce(value, shape: Tuple[int, ...], keepdims: bool = False):
+    if not shape:
+        return value
+    value = np.asarray(value)
+    value = np.broadcast_to(value, np.broadcast_shapes(value.shape, shape))
+    return value.sum(axis=tuple(range(-len(shape), 0)), keepdims=keepdims)
+
+
+def _sum_to(value, shape: Tuple[int, ...]):
+    value = np.asarray(value)
+    value = np.broadcast_to(value, np.broadcast_shapes(value.shape, shape))
+    extra = value.ndim - len(shape)
+    axes = tuple(range(extra)) + tuple(
+        extra + i for i, n in enumerate(shape) if n == 1 and value.shape[extra + i] != 1
+    )
+    return value.sum(axis=axes).reshape(shape)
+
+
+class Sum(ad.Base):
+    name = "sum"
+    cost = 1
+
+    def __init__(self, op: ad.Base):
+        self.op = ad.to_op(op)
+
+    @property
+    def shape(self):
+        return ()
+
+    def _call(self, vars):
+        return self.op._call(vars)
+
+    def _apply(self, value):
+        return value
+
+    def _array_apply(self, value):
+        return _reduce(value, self.op.shape)
+
+    def _batch_apply(self, value):
+        return _reduce(value, self.op.shape, keepdims=True)
+
+    def _interval_apply(self, value):
+        return ad.interval.reduce(value, self.op.shape)
+
+    def _derivative(self, var):
+        if var.shape:
+            return ad.reverse.gradient(self, [var])[0]
+        return Sum(self.op._derivative(var))
+
+    def _partials(self):
+        return [ad.IntConst(1)]
+
+    def _local_partials(self, values, result):
+        return [1]
+
+    def node_cost(self):
+        return self.cost * max(math.prod(self.op.shape) - 1, 0)
+
+    def get_operands(self):
+        return [self.op]
+
+    def get_variables(self):
+        return self.op.get_variables()
+
+    def __str__(self):
+        return f"{self.name}({self.op})"
+
+    def __eq__(self, other):
+        return isinstance(other, Sum) and self.op == other.op
+
+
+class Dot(ad.Base):
+    name = "dot"
+    cost = 2
+
+    def __init__(self, op1: ad.Base, op2: ad.Base):
+        self.op1 = ad.to_op(op1)
+        self.op2 = ad.to_op(op2)
+
+    @property
+    def shape(self):
+        return ()
+
+    def _call(self, vars):
+        return self.op1._call(vars) * self.op2._call(vars)
+
+    def _apply(self, value1, value2):
+        return value1 * value2
+
+    def _array_apply(self, value1, value2):
+        return _reduce(value1 * value2, ad.base._broadcast_shapes(self.op1.shape, self.op2.shape))
+
+    def _batch_apply(self, value1, value2):
+        shape = ad.base._broadcast_shapes(self.op1.shape, self.op2.shape)
+        return _reduce(value1 * value2, shape, keepdims=True)
+
+    def _interval_apply(self, value1, value2):
+        shape = ad.base._broadcast_shapes(self.op1.shape, self.op2.shape)
+        return ad.interval.reduce(ad.interval.mul(value1, value2), shape)
+
+    def _derivative(self, var):
+        if var.shape:
+            return ad.reverse.gradient(self, [var])[0]
+        return Dot(self.op1._derivative(var), self.op2) + Dot(self.op1, self.op2._derivative(var))
+
+    def _partials(self):
+        return [self.op2, self.op1]
+
+    def _local_partials(self, values, result):
+        return [values[1], values[0]]
+
+    def node_cost(self):
+        size = math.prod(ad.base._broadcast_shapes(self.op1.shape, self.op2.shape))
+        return self.cost * size - 1
+
+    def get_operands(self):
+        return [self.op1, self.op2]
+
+    def get_variables(self):
+        return {*self.op1.get_variables(), *self.op2.get_variables()}
+
+    def __str__(self):
+        return f"{self.name}({self.op1}, {self.op2})"
+
+    def __eq__(self, other):
+        if not isinstance(other, Dot):
+            return False
+        return self.op1 == other.op1 and self.op2 == other.op2
+
+
+class SumTo(ad.Base):
+    name = "sum_to"
+    cost = 1
+
+    def __init__(self, op: ad.Base, like: ad.Base):
+        self.op = ad.to_op(op)
+        self.like = ad.to_op(like)
+
+    @property
+    def shape(self):
+        return self.like.shape
+
+    def _call(self, vars):
+        return self.op._call(vars)
+
+    def _apply(self, value, like):
+        return value
+
+    def _array_apply(self, value, like):
+        return _sum_to(value, self.like.shape)
+
+    def _batch_apply(self, value, like):
+        value, target = np.asarray(value), np.shape(like)[1:]
+        if value.ndim == 0:
+            value = value.reshape((1,) * (len(target) + 1))
+        axes = tuple(
+            i + 1 for i, (n, m) in enumerate(zip(value.shape[1:], target)) if m == 1 and n != 1
+        )
+        value = value.sum(axis=axes, keepdims=True)
+        return np.broadcast_to(value, value.shape[:1] + target)
+
+    def _interval_apply(self, value, like):
+        shape = self.like.shape
+        return ad.interval.widen(_sum_to(value.lo, shape), _sum_to(value.hi, shape))
+
+    def _derivative(self, var):
+        return SumTo(self.op._derivative(var), self.like)
+
+    def _partials(self):
+        return [ad.IntConst(1), ad.IntConst(0)]
+
+    def _local_partials(self, values, result):
+        return [1, 0]
+
+    def node_cost(self):
+        return self.cost * max(math.prod(self.op.shape) - math.prod(self.shape), 0)
+
+    def get_operands(self):
+        return [self.op, self.like]
+
+    def get_variables(self):
+        return {*self.op.get_variables(), *self.like.get_variables()}
+
+    def __str__(self):
+        return f"{self.name}({self.op}, {self.like})"
+
+    def __eq__(self, other):
+        if not isinstance(other, SumTo):
+            return False
+        return self.op == other.op and self.like == other.like
+
+
+sum = Sum
+dot = Dot
+sum_to = SumTo
+
+__all__ = ["sum", "dot", "sum_to"]
@@ -2,14 +2,32 @@ import cmath
 
 import autodiff as ad
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 class Sin(ad.Function):
     name = "sin"
+    cost = 15
 
     @staticmethod
     def _func_call(x):
         return cmath.sin(x)
 
+    @staticmethod
+    def _func_array_call(x):
+        return np.sin(x)
+
+    @staticmethod
+    def _func_interval(x):
+        return ad.interval.sin(x)
+
+    @staticmethod
+    def _func_grad(x, result):
+        return cmath.cos(x)
+
     @staticmethod
     def _func_derivative(op):
         return ad.cos(op)
@@ -17,11 +35,24 @@ class Sin(ad.Function):
 
 class Cos(ad.Function):
     name = "cos"
+    cost = 15
 
     @staticmethod
     def _func_call(x):
         return cmath.cos(x)
 
+    @staticmethod
+    def _func_array_call(x):
+        return np.cos(x)
+
+    @staticmethod
+    def _func_interval(x):
+        return ad.interval.cos(x)
+
+    @staticmethod
+    def _func_grad(x, result):
+        return -cmath.sin(x)
+
     @staticmethod
     def _func_derivative(op):
         return -ad.sin(op)
@@ -29,35 +60,80 @@ class Cos(ad.Function):
 
 class Tg(ad.Function):
     name = "tg"
+    cost = 20
 
     @staticmethod
     def _func_call(x):
         return cmath.tan(x)
 
+    @staticmethod
+    def _func_array_call(x):
+        return np.tan(x)
+
+    @staticmethod
+    def _func_interval(x):
+        return ad.interval.tan(x)
+
+    @staticmethod
+    def _func_grad(x, result):
+        return 1 + result**2
+
     @staticmethod
     def _func_derivative(op):
         return 1 / (ad.cos(op) ** 2)
 
+    def _partials(self):
+        return [1 + self**2]
+
 
 class Ctg(ad.Function):
     name = "ctg"
+    cost = 24
 
     @staticmethod
     def _func_call(x):
         return 1 / cmath.tan(x)
 
+    @staticmethod
+    def _func_array_call(x):
+        return 1 / np.tan(x)
+
+    @staticmethod
+    def _func_interval(x):
+        return ad.interval.cot(x)
+
+    @staticmethod
+    def _func_grad(x, result):
+        return -(1 + result**2)
+
     @staticmethod
     def _func_derivative(op):
         return -1 / (ad.sin(op) ** 2)
 
+    def _partials(self):
+        return [-(1 + self**2)]
+
 
 class ArcSin(ad.Function):
     name = "arcsin"
+    cost = 25
 
     @staticmethod
     def _func_call(x):
         return cmath.asin(x)
 
+    @staticmethod
+    def _func_array_call(x):
+        return np.arcsin(x)
+
+    @staticmethod
+    def _func_interval(x):
+        return ad.interval.increasing(np.arcsin, x, -1.0, 1.0)
+
+    @staticmethod
+    def _func_grad(x, result):
+        return 1 / cmath.sqrt(1 - x**2)
+
     @staticmethod
     def _func_derivative(op):
         return 1 / ad.sqrt(1 - op**2)
@@ -65,11 +141,24 @@ class ArcSin(ad.Function):
 
 class ArcCos(ad.Function):
     name = "arccos"
+    cost = 25
 
     @staticmethod
     def _func_call(x):
         return cmath.acos(x)
 
+    @staticmethod
+    def _func_array_call(x):
+        return np.arccos(x)
+
+    @staticmethod
+    def _func_interval(x):
+        return ad.interval.decreasing(np.arccos, x, -1.0, 1.0)
+
+    @staticmethod
+    def _func_grad(x, result):
+        return -1 / cmath.sqrt(1 - x**2)
+
     @staticmethod
     def _func_derivative(op):
         return -1 / ad.sqrt(1 - op**2)
@@ -77,11 +166,24 @@ class ArcCos(ad.Function):
 
 class ArcTg(ad.Function):
     name = "arctg"
+    cost = 20
 
     @staticmethod
     def _func_call(x):
         return cmath.atan(x)
 
+    @staticmethod
+    def _func_array_call(x):
+        return np.arctan(x)
+
+    @staticmethod
+    def _func_interval(x):
+        return ad.interval.increasing(np.arctan, x)
+
+    @staticmethod
+    def _func_grad(x, result):
+        return 1 / (1 + x**2)
+
     @staticmethod
     def _func_derivative(op):
         return 1 / (1 + op**2)
@@ -89,16 +191,138 @@ class ArcTg(ad.Function):
 
 class ArcCtg(ad.Function):
     name = "arcctg"
+    cost = 24
 
     @staticmethod
     def _func_call(x):
         return cmath.atan(1 / x)
 
+    @staticmethod
+    def _func_array_call(x):
+        return np.arctan(1 / x)
+
+    @staticmethod
+    def _func_interval(x):
+        return ad.interval.arccot(x)
+
+    @staticmethod
+    def _func_grad(x, result):
+        return -1 / (1 + x**2)
+
     @staticmethod
     def _func_derivative(op):
         return -1 / (1 + op**2)
 
 
+class SinCos(ad.Base):
+    name = "sincos"
+    cost = 20
+
+    def __init__(self, op: ad.Base):
+        self.op = ad.to_op(op)
+
+    def _call(self, vars):
+        return self._apply(self.op._call(vars))
+
+    def _apply(self, x):
+        if x.imag == 0:
+            w = cmath.exp(1j * x.real)
+            return complex(w.imag), complex(w.real)
+        w = cmath.exp(1j * x)
+        return (w - 1 / w) / 2j, (w + 1 / w) / 2
+
+    def _array_apply(self, x):
+        return np.sin(x), np.cos(x)
+
+    def _interval_apply(self, x):
+        return ad.interval.sin(x), ad.interval.cos(x)
+
+    def _derivative(self, var):
+        raise TypeError("sincos is a pair and has no scalar derivative")
+
+    def get_operands(self):
+        return [self.op]
+
+    def get_variables(self):
+        return self.op.get_variables()
+
+    def __str__(self):
+        return f"sincos({self.op})"
+
+    def __eq__(self, other):
+        return isinstance(other, SinCos) and self.op == other.op
+
+
+class SinPart(ad.Base):
+    name = "sinpart"
+    cost = 0
+
+    def __init__(self, pair: SinCos):
+        self.pair = pair
+
+    def _call(self, vars):
+        return self.pair._call(vars)[0]
+
+    def _apply(self, pair):
+        return pair[0]
+
+    def _array_apply(self, pair):
+        return pair[0]
+
+    def _interval_apply(self, pair):
+        return pair[0]
+
+    def _derivative(self, var):
+        return CosPart(self.pair) * self.pair.op._derivative(var)
+
+    def get_operands(self):
+        return [self.pair]
+
+    def get_variables(self):
+        return self.pair.get_variables()
+
+    def __str__(self):
+        return f"sin({self.pair.op})"
+
+    def __eq__(self, other):
+        return isinstance(other, SinPart) and self.pair == other.pair
+
+
+class CosPart(ad.Base):
+    name = "cospart"
+    cost = 0
+
+    def __init__(self, pair: SinCos):
+        self.pair = pair
+
+    def _call(self, vars):
+        return self.pair._call(vars)[1]
+
+    def _apply(self, pair):
+        return pair[1]
+
+    def _array_apply(self, pair):
+        return pair[1]
+
+    def _interval_apply(self, pair):
+        return pair[1]
+
+    def _derivative(self, var):
+        return -SinPart(self.pair) * self.pair.op._derivative(var)
+
+    def get_operands(self):
+        return [self.pair]
+
+    def get_variables(self):
+        return self.pair.get_variables()
+
+    def __str__(self):
+        return f"cos({self.pair.op})"
+
+    def __eq__(self, other):
+        return isinstance(other, CosPart) and self.pair == other.pair
+
+
 sin = Sin
 cos = Cos
 tg = Tg
@@ -0,0 +1,6 @@
+from benchmarks.workloads import WORKLOADS, Workload
+from benchmarks.runner import run, compare
+from benchmarks.parallel import scaling
+from benchmarks.threads import thread_scaling
+
+__all__ = ["WORKLOADS", "Workload", "run", "compare", "scaling", "thread_scaling"]
@@ -0,0 +1,99 @@
+import argparse
+import json
+import sys
+
+from benchmarks.parallel import scaling
+from benchmarks.runner import compare, run
+from benchmarks.threads import thread_scaling
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the workloads")
+    run_parser.add_argument("-o", "--output", default="bench_output.json")
+    run_parser.add_argument("-r", "--repeat", type=int, default=5)
+    run_parser.add_argument("workloads", nargs="*")
+
+    compare_parser = commands.add_parser("compare", help="compare two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("-t", "--threshold", type=float, default=0.1)
+
+    parallel_parser = commands.add_parser(
+        "parallel", help="measure parallel simplification scaling"
+    )
+    parallel_parser.add_argument("-w", "--workers", type=int, nargs="+", default=[1, 2, 4])
+    parallel_parser.add_argument("-n", "--terms", type=int, default=48)
+    parallel_parser.add_argument("--order", type=int, default=2)
+    parallel_parser.add_argument("-t", "--threshold", type=int, default=2048)
+
+    threads_parser = commands.add_parser(
+        "threads", help="measure throughput scaling with thread count"
+    )
+    threads_parser.add_argument("-j", "--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    threads_parser.add_argument("-n", "--tasks", type=int, default=32)
+    threads_parser.add_argument("-p", "--points", type=int, default=20000)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "threads":
+        report = thread_scaling(args.threads, args.tasks, args.points)
+        print(f"{report['cpus']} cpus, gil {report['gil']}, serial {report['serial']:.3f} s")
+        for row in report["results"]:
+            print(
+                f"{row['threads']:3d} threads {row['time']:10.3f} s "
+                f"{row['tasks_per_second']:10.1f} tasks/s {row['speedup']:6.2f}x "
+                f"{'identical' if row['identical'] else 'MISMATCH'}"
+            )
+        return 0 if all(row["identical"] for row in report["results"]) else 1
+
+    if args.command == "parallel":
+        report = scaling(args.workers, args.terms, args.order, args.threshold)
+        print(f"{report['nodes']} nodes, {report['cpus']} cpus, serial {report['serial']:.3f} s")
+        for row in report["results"]:
+            print(
+                f"{row['workers']:3d} workers {row['time']:10.3f} s "
+                f"{row['speedup']:6.2f}x {'identical' if row['identical'] else 'MISMATCH'}"
+            )
+        return 0 if all(row["identical"] for row in report["results"]) else 1
+
+    if args.command == "run":
+        try:
+            report = run(args.workloads, args.repeat, args.output)
+        except ValueError as error:
+            parser.error(str(error))
+        for name, result in report["results"].items():
+            print(
+                f"{name:<20} {result['time'] * 1e3:10.3f} ms "
+                f"{result['peak_memory'] / 1024:10.1f} KiB "
+                f"{result['nodes_before']:6d} -> {result['nodes_after']:<6d} nodes "
+                f"{result['evaluations_per_second']:12.0f} evals/s"
+            )
+        return 0
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    with open(args.current) as file:
+        current = json.load(file)
+
+    rows = compare(baseline, current, args.threshold)
+    for row in rows:
+        if row["missing"]:
+            print(
+                f"{row['workload']:<20} {row['metric']:<24} "
+                f"{row['baseline']:14.6g} {'missing':>14}"
+            )
+            continue
+        flag = "REGRESSION" if row["regression"] else ""
+        print(
+            f"{row['workload']:<20} {row['metric']:<24} "
+            f"{row['baseline']:14.6g} {row['current']:14.6g} "
+            f"{row['change'] * 100:+8.1f}% {flag}"
+        )
+    return 1 if any(row["regression"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+from typing import Any, Dict, Iterable, List
+import os
+import time
+
+import autodiff as ad
+
+from benchmarks.workloads import x, y
+
+
+def wide_derivative(terms: int = 48, order: int = 2) -> ad.Base:
+    ops = []
+    for i in range(1, terms + 1):
+        op = ad.sin(i * x + y) * ad.exp(x / (i + 1)) / (1 + x**2 + i * y)
+        for _ in range(order):
+            op = op._derivative(x)
+        ops.append(op)
+    return ad.operators.Add(*ops)
+
+
+def scaling(
+    workers: Iterable[int] = (1, 2, 4),
+    terms: int = 48,
+    order: int = 2,
+    threshold: int = 2048,
+) -> Dict[str, Any]:
+    op = wide_derivative(terms, order)
+
+    start = time.perf_counter()
+    expected = ad.basesimp(op)
+    serial = time.perf_counter() - start
+
+    rows: List[Dict[str, Any]] = []
+    for n in workers:
+        start = time.perf_counter()
+        result = ad.basesimp(op, workers=n, threshold=threshold)
+        elapsed = time.perf_counter() - start
+        rows.append({
+            "workers": n,
+            "time": elapsed,
+            "speedup": serial / elapsed,
+            "identical": result == expected and str(result) == str(expected),
+        })
+    return {
+        "cpus": os.cpu_count(),
+        "nodes": ad.metrics(op).tree_nodes,
+        "serial": serial,
+        "results": rows,
+    }
@@ -0,0 +1,136 @@
+from typing import Any, Dict, Iterable, List, Optional
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+import autodiff as ad
+
+from benchmarks.workloads import POINT, WORKLOADS, Workload
+
+
+EVALUATIONS = 2000
+
+# metric -> +1 if larger is worse, -1 if smaller is worse
+DIRECTIONS = {
+    "time": 1,
+    "peak_memory": 1,
+    "nodes_after": 1,
+    "cost_after": 1,
+    "evaluations_per_second": -1,
+    "kernel_evaluations_per_second": -1,
+}
+
+
+def measure(workload: Workload, repeat: int = 5) -> Dict[str, Any]:
+    op = workload.build()
+
+    times = []
+    for _ in range(repeat):
+        ad.cache.clear()
+        start = time.perf_counter()
+        result = workload.run(op)
+        times.append(time.perf_counter() - start)
+
+    ad.cache.clear()
+    tracemalloc.start()
+    try:
+        workload.run(op)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(EVALUATIONS):
+        result.call(POINT)
+    elapsed = time.perf_counter() - start
+
+    kernel = result.compile()
+    start = time.perf_counter()
+    for _ in range(EVALUATIONS):
+        kernel(POINT)
+    kernel_elapsed = time.perf_counter() - start
+
+    before, after = ad.metrics(op), ad.metrics(result)
+    return {
+        "time": statistics.median(times),
+        "time_min": min(times),
+        "peak_memory": peak,
+        "nodes_before": before.tree_nodes,
+        "nodes_after": after.tree_nodes,
+        "depth_after": after.depth,
+        "cost_after": after.cost,
+        "evaluations_per_second": EVALUATIONS / elapsed,
+        "kernel_evaluations_per_second": EVALUATIONS / kernel_elapsed,
+        "kernel_flops_saved": kernel.report.saved,
+    }
+
+
+def run(
+    names: Optional[Iterable[str]] = None,
+    repeat: int = 5,
+    output: Optional[str] = None,
+) -> Dict[str, Any]:
+    names = set(names) if names else None
+    if names is not None:
+        unknown = names - {workload.name for workload in WORKLOADS}
+        if unknown:
+            raise ValueError(
+                f"unknown workloads: {', '.join(sorted(unknown))}; "
+                f"valid names are {', '.join(workload.name for workload in WORKLOADS)}"
+            )
+    report = {
+        "meta": {
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "repeat": repeat,
+            "evaluations": EVALUATIONS,
+        },
+        "results": {},
+    }
+    for workload in WORKLOADS:
+        if names is None or workload.name in names:
+            report["results"][workload.name] = measure(workload, repeat)
+
+    if output is not None:
+        with open(output, "w") as file:
+            json.dump(report, file, indent=2, sort_keys=True)
+    return report
+
+
+def compare(
+    baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.1
+) -> List[Dict[str, Any]]:
+    rows = []
+    for name, new in current["results"].items():
+        old = baseline["results"].get(name)
+        if old is None:
+            continue
+        for metric, direction in DIRECTIONS.items():
+            if not old.get(metric):
+                continue
+            if new.get(metric) is None:
+                rows.append({
+                    "workload": name,
+                    "metric": metric,
+                    "baseline": old[metric],
+                    "current": None,
+                    "change": None,
+                    "missing": True,
+                    "regression": False,
+                })
+                continue
+            change = (new[metric] - old[metric]) / old[metric]
+            rows.append({
+                "workload": name,
+                "metric": metric,
+                "baseline": old[metric],
+                "current": new[metric],
+                "change": change,
+                "missing": False,
+                "regression": change * direction > threshold,
+            })
+    return rows
@@ -0,0 +1,60 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Tuple
+import os
+import sys
+import time
+
+import autodiff as ad
+
+from benchmarks.workloads import x, y
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def expression(i: int) -> ad.Base:
+    return ad.sin((i % 7 + 1) * x + y) * ad.exp(x / (i + 2)) / (1 + y**2 + i * x**2)
+
+
+def task(i: int, points: int) -> Tuple[str, complex]:
+    derivative = expression(i).derivative(x, y)
+    kernel = derivative.compile()
+    if np is None:
+        value = sum(kernel({"x": k / points, "y": 0.5}) for k in range(points))
+    else:
+        columns = {"x": np.linspace(0, 1, points), "y": np.full(points, 0.5)}
+        value = complex(kernel.array(columns).sum())
+    return str(derivative), value
+
+
+def thread_scaling(
+    threads: Iterable[int] = (1, 2, 4, 8), tasks: int = 32, points: int = 20000
+) -> Dict[str, Any]:
+    task(tasks, points)
+    ad.cache.clear()
+    start = time.perf_counter()
+    expected = [task(i, points) for i in range(tasks)]
+    serial = time.perf_counter() - start
+
+    rows: List[Dict[str, Any]] = []
+    for n in threads:
+        ad.cache.clear()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(n) as pool:
+            results = list(pool.map(task, range(tasks), [points] * tasks))
+        elapsed = time.perf_counter() - start
+        rows.append({
+            "threads": n,
+            "time": elapsed,
+            "tasks_per_second": tasks / elapsed,
+            "speedup": serial / elapsed,
+            "identical": results == expected,
+        })
+    return {
+        "cpus": os.cpu_count(),
+        "gil": getattr(sys, "_is_gil_enabled", lambda: True)(),
+        "serial": serial,
+        "results": rows,
+    }
@@ -0,0 +1,65 @@
+from typing import Callable, Dict, List, NamedTuple
+
+import autodiff as ad
+
+
+x = ad.Variable("x")
+y = ad.Variable("y")
+
+POINT = {"x": 0.7, "y": 1.3}
+
+
+class Workload(NamedTuple):
+    name: str
+    build: Callable[[], ad.Base]
+    run: Callable[[ad.Base], ad.Base]
+
+
+def nested_product() -> ad.Base:
+    op = ad.Const(1)
+    for i in range(1, 9):
+        op = op * (x + i * y)
+    return op
+
+
+def nested_power() -> ad.Base:
+    op = x
+    for i in range(2, 6):
+        op = (op + y) ** i
+    return op
+
+
+def high_order() -> ad.Base:
+    return ad.sin(x) * ad.exp(x) / (1 + x**2)
+
+
+def wide_polynomial() -> ad.Base:
+    terms = [(i + 1) * x**i * y ** (i % 3) for i in range(60)]
+    return ad.operators.Add(*terms)
+
+
+def deep_chain() -> ad.Base:
+    op = x
+    for i in range(8):
+        op = ad.sin(op) + ad.sqrt(1 + op**2) if i % 2 else ad.exp(op / 4)
+    return op
+
+
+def trig_composition() -> ad.Base:
+    return ad.tg(ad.sin(x) * ad.cos(y)) + ad.ctg(x + y) * ad.arctg(x * y)
+
+
+WORKLOADS: List[Workload] = [
+    Workload("nested_product", nested_product, lambda op: op.derivative(x)),
+    Workload("nested_power", nested_power, lambda op: op.derivative(x)),
+    Workload("high_order", high_order, lambda op: op.derivative((x, 4))),
+    Workload(
+        "wide_polynomial",
+        wide_polynomial,
+        lambda op: ad.basesimp.multiadd(*op.get_operands()),
+    ),
+    Workload("deep_chain", deep_chain, lambda op: op.derivative(x)),
+    Workload("trig_composition", trig_composition, lambda op: op.derivative(x, y)),
+]
+
+BY_NAME: Dict[str, Workload] = {workload.name: workload for workload in WORKLOADS}
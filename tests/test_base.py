@@ -0,0 +1,70 @@
+import cmath
+import pickle
+
+import pytest
+
+import autodiff as ad
+
+x, y = ad.Variable("x"), ad.Variable("y")
+
+
+@pytest.mark.parametrize("a, b", [
+    (ad.FloatConst(0.0), ad.FloatConst(-0.0)),
+    (ad.ComplexConst(0j), ad.ComplexConst(complex(-0.0, 0.0))),
+    (ad.IntConst(2), ad.IntConst(2)),
+    (x * ad.FloatConst(0.5), x * ad.FloatConst(0.5)),
+])
+def test_equal_nodes_hash_equal(a, b):
+    assert a == b
+    assert hash(a) == hash(b)
+    assert len({a, b}) == 1
+
+
+def test_nodes_are_immutable():
+    op = ad.sin(x) + y
+    with pytest.raises(AttributeError):
+        op.ops = ()
+    with pytest.raises(AttributeError):
+        del op.ops
+
+
+def test_with_operands_shares_unchanged_nodes():
+    op = ad.sin(x) * y
+    assert op.with_operands(*op.get_operands()) is op
+    assert op.copy() is op
+
+
+def test_pickle_round_trip():
+    op = ad.exp(-x) / (1 + y**2)
+    clone = pickle.loads(pickle.dumps(op))
+    assert clone == op
+    assert hash(clone) == hash(op)
+
+
+def test_pickle_drops_cached_hashes():
+    op = ad.sin(x) + y
+    hash(op)
+    state = pickle.loads(pickle.dumps(op)).__dict__
+    assert "_hash" not in state
+
+
+def _same(a, b):
+    return (cmath.isnan(a) and cmath.isnan(b)) or abs(a - b) <= 1e-12 * max(abs(b), 1)
+
+
+@pytest.mark.parametrize("op", [
+    x / 0,
+    x + ad.Const(0.0) ** -2,
+    ad.arcsin(2.0) + x,
+    ad.ln(ad.Const(-1)) * x,
+    1 / (x - 1),
+])
+def test_array_evaluation_matches_call_for_constants(op):
+    points = [1.0, -2.0, 0.5]
+    expected = [op.call(x=value) for value in points]
+    for values in (
+        op.array_call(x=points).tolist(),
+        op.batch_call([{"x": value} for value in points]),
+        list(op.stream({"x": value} for value in points)),
+    ):
+        assert all(_same(a, b) for a, b in zip(values, expected))
@@ -0,0 +1,64 @@
+import threading
+
+import autodiff as ad
+
+
+def test_concurrent_get_or_compute_agrees_on_one_value():
+    cache = ad.StripedCache(maxsize=256, stripes=4)
+    barrier = threading.Barrier(8)
+    results = [[] for _ in range(8)]
+
+    def work(index):
+        barrier.wait()
+        for key in range(64):
+            results[index].append(cache.get_or_compute(key, lambda: object()))
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for values in results[1:]:
+        assert all(a is b for a, b in zip(values, results[0]))
+    stats = cache.stats()
+    assert stats["size"] == 64
+    assert stats["hits"] + stats["misses"] == 8 * 64
+    assert stats["misses"] >= 64
+
+
+def test_eviction_is_least_recently_used_per_stripe():
+    cache = ad.StripedCache(maxsize=4, stripes=2)
+    assert cache.stripe_size == 2
+    for key in (0, 2, 1):
+        cache.put(key, str(key))
+    assert cache.get(0) == "0"
+    cache.put(4, "4")
+    assert cache.get(2) is None
+    assert [cache.get(key) for key in (0, 4, 1)] == ["0", "4", "1"]
+    cache.put(3, "3")
+    cache.put(5, "5")
+    assert cache.get(1) is None
+    assert len(cache) == 4
+
+
+def test_put_keeps_the_first_value_and_stats_count_lookups():
+    cache = ad.StripedCache()
+    assert cache.put("a", 1) == 1
+    assert cache.put("a", 2) == 1
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get_or_compute("b", lambda: 3) == 3
+    assert cache.stats() == {"hits": 1, "misses": 2, "size": 2}
+    cache.clear()
+    assert cache.stats()["size"] == 0
+
+
+def test_clear_empties_the_shared_caches():
+    x = ad.Variable("x")
+    (x**3).derivative(x)
+    ad.compile(x**3)
+    assert len(ad.derivatives) and len(ad.kernels)
+    ad.clear()
+    for cache in (ad.derivatives, ad.kernels, ad.evaluators, ad.tangent_programs):
+        assert len(cache) == 0
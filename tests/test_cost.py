@@ -0,0 +1,36 @@
+import autodiff as ad
+
+x, y = ad.Variable("x"), ad.Variable("y")
+
+
+def test_shared_subexpression_is_counted_once_in_the_dag():
+    shared = ad.sin(x + y)
+    op = ad.exp(shared) * ad.cos(shared)
+    assert ad.metrics(op) == ad.Metrics(
+        nodes=7, tree_nodes=11, depth=5, distinct=7, cost=68, dag_cost=52
+    )
+
+
+def test_equal_copies_are_distinct_nodes_but_one_class():
+    op = ad.exp(ad.sin(x + y)) * ad.cos(ad.sin(x + y))
+    metrics = ad.metrics(op)
+    assert metrics.nodes == 9
+    assert metrics.distinct == 7
+    assert metrics.dag_cost == 52
+
+
+def test_metrics_do_not_expand_the_tree():
+    op = x
+    for _ in range(40):
+        op = ad.sin(op) + ad.cos(op)
+    metrics = ad.metrics(op)
+    assert metrics.nodes == metrics.distinct == 3 * 40 + 1
+    assert metrics.tree_nodes == 2**42 - 3
+    assert metrics.depth == 2 * 40 + 1
+    assert metrics.cost == 31 * (2**40 - 1)
+    assert metrics.dag_cost == 31 * 40
+
+
+def test_shaped_leaves_are_not_merged_with_scalars():
+    X = ad.Variable("x", (3,))
+    assert ad.metrics(ad.operators.Add(ad.sin(x), ad.sin(X))).distinct == 5
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+import autodiff as ad
+
+x, y, z = ad.Variable("x"), ad.Variable("y"), ad.Variable("z")
+X = ad.Variable("X", (3,))
+
+
+def test_tangent_programs_are_released_by_cache_clear():
+    ad.cache.clear()
+    assert ad.hessian_vector_product(x**3 * y, {"x": 2, "y": 1}, [1, 0]) == [12, 12]
+    assert len(ad.cache.tangent_programs) == 1
+    ad.cache.clear()
+    assert len(ad.cache.tangent_programs) == 0
+
+
+@pytest.mark.parametrize("hvp", [
+    lambda op, values: ad.hessian_vector_product(op, values, [1, 1]),
+    lambda op, values: ad.batch_hessian_vector_product(op, values, [[1, 1]]),
+])
+def test_shaped_variables_are_rejected(hvp):
+    with pytest.raises(ValueError, match="scalar variables"):
+        hvp(ad.tensor.Sum(X * x), {"x": 1.0, "X": np.ones(3)})
+
+
+VARS = [x, y, z]
+EXPRESSIONS = [
+    x**2 * y + ad.sin(x * z) + ad.exp(y / z),
+    ad.ln(x * y) * ad.sqrt(z) + x**y,
+    ad.arctg(x - y) / (1 + z**2) + ad.cbrt(x) * ad.tg(z),
+    ad.abs(x - y) * z**3 + ad.rsqrt(x),
+]
+
+
+def _hessian(op, point):
+    return np.array([[complex(op.derivative(a, b).call(point)) for b in VARS] for a in VARS])
+
+
+@pytest.mark.parametrize("op", EXPRESSIONS)
+def test_hvp_matches_symbolic_hessian(op):
+    rng = np.random.default_rng(1)
+    for _ in range(10):
+        point = dict(zip("xyz", rng.uniform(0.2, 2, 3)))
+        hessian = _hessian(op, point)
+        vector = rng.normal(size=3)
+        np.testing.assert_allclose(op.hvp(point, vector), hessian @ vector, rtol=1e-9, atol=1e-9)
+        vectors = rng.normal(size=(5, 3))
+        np.testing.assert_allclose(op.batch_hvp(point, vectors), vectors @ hessian.T, rtol=1e-9, atol=1e-9)
+
+
+def test_hvp_accepts_sparse_directions():
+    op = EXPRESSIONS[0]
+    point = {"x": 1.0, "y": 2.0, "z": 3.0}
+    hessian = _hessian(op, point)
+    np.testing.assert_allclose(op.hvp(point, {"x": 1}), hessian[:, 0], rtol=1e-9)
+    np.testing.assert_allclose(op.batch_hvp(point, [{"x": 1}, {"z": 1}]), hessian[:, [0, 2]].T, rtol=1e-9)
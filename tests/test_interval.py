@@ -0,0 +1,98 @@
+import math
+
+import numpy as np
+import pytest
+
+import autodiff as ad
+from autodiff.trigonometry import CosPart, SinCos, SinPart
+
+x, y = ad.Variable("x"), ad.Variable("y")
+V = ad.Variable("V", (3,))
+
+EXPRESSIONS = [
+    x**2 - 3 * x * y + ad.sin(x) * ad.cos(y),
+    ad.exp(x) / (1 + y**2),
+    ad.sqrt(x) + ad.ln(y),
+    ad.tg(x) + ad.ctg(y),
+    ad.arcsin(x / 3) - ad.arccos(y / 3) + ad.arctg(x * y) + ad.arcctg(y),
+    ad.abs(x - y) ** 3,
+    x**-2 + y**0.5,
+    ad.cbrt(x) * ad.rsqrt(y),
+    ad.lg(x * y),
+    x**y,
+    (x + 1) ** 2.0,
+    ad.sin(x * 7) * ad.cos(3 * y + 1),
+    1 / (x - y),
+    ad.e**x,
+    (x * y) ** -3,
+]
+
+
+@pytest.fixture(scope="module")
+def boxes():
+    rng = np.random.default_rng(0)
+    centers = rng.uniform(-4, 4, (2000, 2))
+    widths = rng.exponential(1, (2000, 2)) * rng.choice([0.01, 1, 5], (2000, 2))
+    integer = rng.random(2000) < 0.2
+    centers[integer, 1] = np.round(centers[integer, 1])
+    widths[integer, 1] = 0
+    return centers - widths, centers + widths
+
+
+@pytest.mark.parametrize("op", EXPRESSIONS + [op.derivative(x) for op in EXPRESSIONS], ids=str)
+def test_enclosure_is_sound(op, boxes):
+    lo, hi = boxes
+    result = op.interval_call(
+        x=np.stack([lo[:, 0], hi[:, 0]], -1), y=(lo[:, 1], hi[:, 1])
+    )
+    assert result.lo.shape == (len(lo),)
+
+    rng = np.random.default_rng(1)
+    samples = [lo, hi] + [lo + rng.uniform(size=lo.shape) * (hi - lo) for _ in range(28)]
+    for point in samples:
+        value = op.array_call({"x": point[:, 0], "y": point[:, 1]})
+        real = np.isfinite(value) & (
+            np.abs(value.imag) <= 1e-9 * np.maximum(np.abs(value.real), 1e-300)
+        )
+        inside = (result.lo <= value.real) & (value.real <= result.hi)
+        assert not (real & ~inside).any()
+
+
+def test_sin_bounds_reach_the_peak():
+    result = ad.interval.evaluate(ad.sin(x), x=(0, math.pi))
+    assert result.lo <= 0 and result.hi == 1
+
+
+def test_empty_domain_gives_nan():
+    assert ad.sqrt(x).interval_call(x=(-2, -1)).empty
+
+
+def test_power_of_negative_base():
+    result = (x**y).interval_call(x=(-2, -1), y=(2, 2))
+    assert result.lo <= 1 and 4 <= result.hi and result.contains(2.25)
+    result = (x**y).interval_call(x=(-2, -1), y=(3, 3))
+    assert result.lo <= -8 and -1 <= result.hi
+    result = (x**y).interval_call(x=(-2, 1), y=(2, 3))
+    assert result.contains(4) and result.contains(-8)
+
+
+def test_polynomial_and_shared_sincos():
+    result = ad.polynomial(x**3 - 2 * x + 1).interval_call(x=(-1, 2))
+    assert result.lo <= -0.1 and result.hi >= 5
+    pair = SinCos(x)
+    result = (SinPart(pair) * CosPart(pair)).interval_call(x=(0, 1))
+    assert result.lo <= 0 and math.sin(1) <= result.hi <= 1
+
+
+def test_tensor_reductions_enclose_the_sum():
+    box = (np.array([-1.0, 0.0, 1.0]), np.array([1.0, 2.0, 3.0]))
+    for op in (ad.sum(V * V), ad.dot(V, V)):
+        result = op.interval_call(V=box)
+        assert result.lo <= 1 and result.hi >= 14
+
+
+def test_missing_variable_and_complex_constant_are_rejected():
+    with pytest.raises(ValueError, match="unknown variable"):
+        x.interval_call()
+    with pytest.raises(ValueError, match="complex"):
+        (x + 1j).interval_call(x=(0, 1))
@@ -0,0 +1,36 @@
+import pytest
+
+import autodiff as ad
+
+x, y = ad.Variable("x"), ad.Variable("y")
+
+
+def test_minimize_finds_quadratic_minimum():
+    result = ad.optimize.minimize((x - 1) ** 2 + (y + 2) ** 2, {"x": 3.0, "y": 0.0})
+    assert result.converged
+    assert abs(result.x["x"] - 1) < 1e-6 and abs(result.x["y"] + 2) < 1e-6
+
+
+def test_evaluators_are_released_by_cache_clear():
+    ad.cache.clear()
+    ad.optimize.root([x**2 - 2], {"x": 1.0})
+    assert len(ad.cache.evaluators) == 1
+    ad.cache.clear()
+    assert len(ad.cache.evaluators) == 0
+
+
+@pytest.mark.parametrize("solve", [
+    lambda op, x0, vars=None: ad.optimize.minimize(op, x0, vars),
+    lambda op, x0, vars=None: ad.optimize.root([op], x0, vars),
+])
+def test_variable_free_expressions_need_vars(solve):
+    op = ad.Const(3) + 0 * x
+    with pytest.raises(ValueError, match="no variables"):
+        solve(op, {"x": 3.0})
+    with pytest.raises(ValueError, match="at least one variable"):
+        solve(op, {"x": 3.0}, [])
+
+
+def test_constant_objective_with_named_variable_converges():
+    result = ad.optimize.minimize(ad.Const(3) + 0 * x, {"x": 3.0}, vars=["x"])
+    assert result.converged and result.x == {"x": 3.0} and result.value == 3.0
@@ -0,0 +1,84 @@
+import asyncio
+import itertools
+
+import numpy as np
+import pytest
+
+import autodiff as ad
+
+
+def test_constant_expression_takes_rows_from_columns(tmp_path):
+    np.save(tmp_path / "x.npy", np.arange(5.0))
+    out = tmp_path / "out.npy"
+    report = ad.evaluate_columns(ad.Const(3), {"x": tmp_path / "x.npy"}, out)
+    assert report.rows == 5
+    assert np.load(out).tolist() == [3] * 5
+
+
+def test_constant_expression_without_columns_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        ad.evaluate_columns(ad.Const(3), tmp_path, tmp_path / "out.npy")
+
+
+def test_columns_from_directory(tmp_path):
+    np.save(tmp_path / "x.npy", np.arange(4.0))
+    out = tmp_path / "out.npy"
+    ad.evaluate_columns(2 * ad.Variable("x"), tmp_path, out, block_size=3)
+    assert np.load(out).tolist() == [0, 2, 4, 6]
+
+
+def _counted(records, pulled):
+    for record in records:
+        pulled.append(record)
+        yield record
+
+
+def test_stream_evaluates_in_chunks():
+    x, y = ad.Variable("x"), ad.Variable("y")
+    records = [(i, 2 * i) for i in range(7)]
+    pulled = []
+    values = (x + y).stream(_counted(records, pulled), chunk_size=3)
+    assert next(values) == 0
+    assert len(pulled) == 3
+    assert [next(values) for _ in range(3)] == [3, 6, 9]
+    assert len(pulled) == 6
+    assert list(values) == [12, 15, 18]
+    with pytest.raises(ValueError):
+        next(x.stream([], chunk_size=0))
+
+
+def test_stream_is_lazy_on_infinite_iterators():
+    x = ad.Variable("x")
+    pulled = []
+    values = (x * x).stream(_counted(zip(itertools.count()), pulled), chunk_size=4, names=["x"])
+    assert list(itertools.islice(values, 6)) == [0, 1, 4, 9, 16, 25]
+    assert len(pulled) == 8
+
+
+def test_astream_yields_chunked_values():
+    x = ad.Variable("x")
+    pulled = []
+
+    async def records():
+        for i in itertools.count():
+            pulled.append(i)
+            yield {"x": i}
+            if i == 4:
+                return
+
+    async def main():
+        return [value async for value in (2 * x).astream(records(), chunk_size=2)]
+
+    assert asyncio.run(main()) == [0, 2, 4, 6, 8]
+    assert pulled == [0, 1, 2, 3, 4]
+
+    async def first_values():
+        values = (2 * x).astream(_forever(), chunk_size=3)
+        return [await values.__anext__() for _ in range(4)]
+
+    assert asyncio.run(first_values()) == [0, 2, 4, 6]
+
+
+async def _forever():
+    for i in itertools.count():
+        yield {"x": i}
@@ -0,0 +1,53 @@
+import cmath
+
+import autodiff as ad
+
+x, y = ad.Variable("x"), ad.Variable("y")
+
+
+def test_compile_converts_polynomial_sums():
+    kernel = ad.compile(x**7 + x)
+    assert isinstance(kernel.op, ad.Polynomial)
+    assert kernel.report.rules["polynomial"]["hits"] == 1
+    assert abs(kernel({"x": 1.3}) - (x**7 + x).call(x=1.3)) < 1e-12
+
+
+def test_polynomial_conversion_can_be_disabled():
+    op, report = ad.strength_reduce(x**7 + x, polynomials=False)
+    assert not isinstance(op, ad.Polynomial)
+    assert "polynomial" not in report.rules
+
+
+def test_non_polynomial_terms_are_kept():
+    op, _ = ad.strength_reduce(ad.sin(x) + x**7 + y)
+    assert not isinstance(op, ad.Polynomial)
+    assert abs(ad.compile(op, optimize=False)({"x": 0.4, "y": 2}) - (ad.sin(x) + x**7 + y).call(x=0.4, y=2)) < 1e-12
+
+
+def test_compiled_polynomial_matches_horner_evaluation():
+    op = 3 * x**7 + 2 * x**5 * y**2 - x**3 * y + y**4
+    kernel = ad.compile(op)
+    poly = ad.Polynomial.from_expr(op)
+    assert isinstance(kernel.op, ad.Polynomial)
+    for point in ({"x": 0.7, "y": 1.3}, {"x": -2, "y": 0.5}):
+        assert abs(kernel(point) - poly.call(point)) < 1e-9
+    values = kernel.array(x=[0.7, -2], y=[1.3, 0.5])
+    assert abs(values[1] - poly.call(x=-2, y=0.5)) < 1e-9
+    assert cmath.isnan(kernel({"x": 1}))
+
+
+def test_cancelled_terms_keep_nested_polynomial_variables():
+    op = 1 - (x - x) * -1
+    assert op.compile()({"x": 1}) == 1
+    assert op.batch_call([{"x": 1}, {"x": 2}]) == [1, 1]
+    assert list(op.stream([{"x": 3}])) == [1]
+    nested = ad.polynomial(ad.operators.Add(ad.polynomial(x - x + y), y))
+    assert nested.call(x=5, y=2) == 4
+
+
+def test_compiled_division_by_zero_matches_call():
+    kernel = ad.compile(x / 0)
+    assert cmath.isnan((x / 0).call(x=1))
+    assert cmath.isnan(kernel({"x": 1}))
+    assert all(cmath.isnan(value) for value in kernel.array(x=[1.0, 2.0]))
+    assert all(cmath.isnan(value) for value in kernel.batch([{"x": 1}, {"x": 2}]))
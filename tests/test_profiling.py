@@ -0,0 +1,78 @@
+import sys
+import threading
+
+import pytest
+
+import autodiff as ad
+
+x, y = ad.Variable("x"), ad.Variable("y")
+
+
+def _call_stats(profile):
+    return {name: methods["_call"] for name, methods in profile.nodes.items() if "_call" in methods}
+
+
+def test_nested_calls_form_a_tree():
+    op = ad.sin(x * y) + x
+    with ad.profile() as profile:
+        op._call({"x": 1, "y": 2})
+    stats = _call_stats(profile)
+    assert {name: entry["calls"] for name, entry in stats.items()} == {
+        "Add": 1, "Sin": 1, "Mul": 1, "Variable": 3,
+    }
+    for entry in stats.values():
+        assert 0 <= entry["self_time"] <= entry["time"]
+    assert stats["Variable"]["self_time"] == stats["Variable"]["time"]
+    assert stats["Add"]["time"] >= stats["Sin"]["time"] >= stats["Mul"]["time"]
+    total = sum(entry["self_time"] for entry in stats.values())
+    assert total == pytest.approx(stats["Add"]["time"])
+
+
+def test_threads_keep_separate_call_stacks():
+    op = ad.sin(x * y) + ad.cos(x) * y
+    barrier = threading.Barrier(4)
+
+    def work():
+        barrier.wait()
+        for _ in range(200):
+            op._call({"x": 1, "y": 2})
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ad.profile() as profile:
+            threads = [threading.Thread(target=work) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    stats = _call_stats(profile)
+    assert stats["Add"]["calls"] == 800
+    assert stats["Variable"]["calls"] == 3200
+    for entry in stats.values():
+        assert entry["self_time"] >= 0
+    total = sum(entry["self_time"] for entry in stats.values())
+    assert total == pytest.approx(stats["Add"]["time"])
+
+
+def test_methods_are_restored_on_exit():
+    classes = [ad.operators.Add, ad.Variable, ad.simplify.Simplifier]
+    originals = [dict(cls.__dict__) for cls in classes]
+    with pytest.raises(ZeroDivisionError):
+        with ad.profile() as profile:
+            assert ad.operators.Add.__dict__["_call"] is not originals[0]["_call"]
+            (x + y).simplify()
+            1 / 0
+    for cls, original in zip(classes, originals):
+        assert dict(cls.__dict__) == original
+    assert profile.simplifier["calls"] >= 1
+    assert ad.Profile._active is None
+
+
+def test_profiles_do_not_nest():
+    with ad.profile():
+        with pytest.raises(RuntimeError):
+            with ad.profile():
+                pass
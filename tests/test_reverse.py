@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+import autodiff as ad
+
+x, y = ad.Variable("x"), ad.Variable("y")
+X = ad.Variable("X", (3,))
+M = ad.Variable("M", (2, 3))
+w = ad.Variable("w")
+
+VALUES = {
+    "x": 0.7, "y": -1.3, "w": 0.5,
+    "X": np.array([1.0, 2.0, 3.0]),
+    "M": np.arange(6.0).reshape(2, 3),
+}
+
+
+@pytest.mark.parametrize("op", [
+    x**2 * y + ad.sin(x * y) + ad.exp(y / (1 + x**2)),
+    ad.ln(1 + x**2) * ad.sqrt(2 + y) - x / y,
+    ad.sum(X * w),
+    ad.dot(X, X * w),
+    ad.sum(ad.sin(X * w) * y) + w**2,
+    ad.dot(X, X) * w * y,
+])
+def test_gradient_matches_derivative(op):
+    vars = [var for var in (x, y, X, M, w) if var in op.get_variables()]
+    for var, gradient in zip(vars, ad.gradient(op, vars)):
+        assert np.allclose(gradient.call(VALUES), op.derivative(var).call(VALUES))
+
+
+def test_gradient_of_sum_with_respect_to_scalar_is_reduced():
+    gradient = ad.gradient(ad.sum(X * w), [X, w])[1]
+    assert gradient.call(VALUES) == 6
+
+
+def test_gradient_sums_over_broadcast_axes():
+    op = ad.sum(M * X * w) + x
+    gradient_X, gradient_M = ad.gradient(op, [X, M])
+    expected = VALUES["M"].sum(axis=0) * VALUES["w"]
+    assert np.allclose(gradient_X.call(VALUES), expected)
+    assert np.allclose(gradient_M.call(VALUES), np.broadcast_to(VALUES["X"] * VALUES["w"], (2, 3)))
+    for var, gradient in zip([w, x], ad.gradient(op, [w, x])):
+        assert np.allclose(gradient.call(VALUES), op.derivative(var).call(VALUES))
+
+
+def test_gradient_has_the_shape_of_its_variable():
+    gradient, = ad.gradient(ad.sum(X) * w, [X])
+    assert gradient.shape == (3,)
+    assert np.allclose(gradient.call(VALUES), [0.5, 0.5, 0.5])
+    records = [VALUES, {**VALUES, "w": 2.0}]
+    assert np.allclose(gradient.batch_call(records), [[0.5] * 3, [2.0] * 3])
+    unused, = ad.gradient(w**2, [X])
+    assert np.allclose(unused.call(VALUES), [0, 0, 0])
+
+
+def test_gradient_rejects_shaped_results():
+    with pytest.raises(ValueError):
+        ad.gradient(ad.sin(X) * w, [w])
+
+
+def _chain(length):
+    op = x
+    for _ in range(length):
+        op = ad.sin(op) * y + x
+    return op
+
+
+@pytest.mark.parametrize("strategy", ad.reverse.STRATEGIES)
+@pytest.mark.parametrize("budget", [None, 320, 1280, 5000])
+def test_checkpointed_gradient_stays_within_budget(strategy, budget):
+    op = _chain(100)
+    values = {"x": 0.3, "y": 0.9}
+    expected = op.gradient_call(values, strategy="all")
+    result = op.gradient_call(values, budget=budget, strategy=strategy)
+    assert np.allclose(result.gradient, expected.gradient)
+    if budget is not None:
+        assert result.report.peak_bytes <= budget
+
+
+def test_checkpointed_gradient_matches_derivative_on_shared_subtrees():
+    shared = ad.sin(x * y)
+    op = shared**2 + ad.exp(shared) * x - ad.ln(2 + shared) / y
+    values = {"x": 0.3, "y": 0.9}
+    result = op.gradient_call(values, budget=400, strategy="uniform")
+    expected = [op.derivative(var).call(values) for var in (x, y)]
+    assert np.allclose(result.gradient, expected)
+    assert result.report.peak_bytes <= 400
+
+
+def test_too_small_budget_is_rejected():
+    with pytest.raises(ValueError):
+        _chain(10).gradient_call({"x": 0.3, "y": 0.9}, budget=0)
+
+
+def test_numeric_gradient_rejects_shaped_variables():
+    with pytest.raises(ValueError):
+        ad.sum(X * w).gradient_call(VALUES)
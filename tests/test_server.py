@@ -0,0 +1,102 @@
+import asyncio
+import json
+
+import pytest
+
+import autodiff as ad
+
+x = ad.Variable("x")
+y = ad.Variable("y")
+
+
+def test_requests_within_window_share_a_batch():
+    async def main():
+        server = ad.EvaluationServer(window=0.01)
+        server.register("f", x * x + 1)
+        values = await asyncio.gather(*(server.evaluate("f", x=i) for i in range(5)))
+        return server, values
+
+    server, values = asyncio.run(main())
+    assert values == [i * i + 1 for i in range(5)]
+    assert server.requests == 5
+    assert server.batches == 1
+    assert server.queue_depth == 0
+    assert server.max_queue_depth == 5
+
+
+def test_full_batch_is_flushed_without_waiting():
+    async def main():
+        server = ad.EvaluationServer(window=60, max_batch=2)
+        server.register("f", x + y)
+        return server, await asyncio.gather(*(server.evaluate("f", x=i, y=1) for i in range(4)))
+
+    server, values = asyncio.run(main())
+    assert values == [1, 2, 3, 4]
+    assert server.batches == 2
+
+
+def test_bad_request_fails_alone():
+    async def main():
+        server = ad.EvaluationServer(window=0.01)
+        server.register("f", x + y)
+        return await asyncio.gather(
+            server.evaluate("f", x=1, y=2),
+            server.evaluate("f", x=[1, 2], y=2),
+            server.evaluate("f", x=3, y=4),
+            return_exceptions=True,
+        )
+
+    first, second, third = asyncio.run(main())
+    assert first == 3
+    assert isinstance(second, TypeError)
+    assert third == 7
+
+
+def test_unknown_expression_is_rejected():
+    with pytest.raises(ValueError):
+        asyncio.run(ad.EvaluationServer().evaluate("f", x=1))
+
+
+def test_unregister_flushes_pending_requests():
+    async def main():
+        server = ad.EvaluationServer(window=60)
+        server.register("f", 2 * x)
+        request = asyncio.ensure_future(server.evaluate("f", x=4))
+        await asyncio.sleep(0)
+        server.unregister("f")
+        return server, await request
+
+    server, value = asyncio.run(main())
+    assert value == 8
+    assert server.expressions == []
+    assert server.queue_depth == 0
+
+
+def test_unix_socket_round_trip_and_shutdown(tmp_path):
+    path = str(tmp_path / "server.sock")
+
+    async def main():
+        server = ad.EvaluationServer(window=0.001)
+        server.register("f", x * y)
+        listener = await server.serve_unix(path)
+        reader, writer = await asyncio.open_unix_connection(path)
+        requests = [
+            {"id": 1, "name": "f", "values": {"x": 2, "y": [0, 1]}},
+            {"id": 2, "name": "g", "values": {"x": 2}},
+            {"id": 3, "op": "stats"},
+        ]
+        for request in requests:
+            writer.write(json.dumps(request).encode() + b"\n")
+        await writer.drain()
+        responses = [json.loads(await reader.readline()) for _ in requests]
+        writer.close()
+        listener.close()
+        await listener.wait_closed()
+        return listener, responses
+
+    listener, responses = asyncio.run(main())
+    responses = {response["id"]: response for response in responses}
+    assert responses[1]["value"] == [0, 2]
+    assert responses[2]["error"].startswith("ValueError")
+    assert responses[3]["stats"]["expressions"] == ["f"]
+    assert not listener.is_serving()
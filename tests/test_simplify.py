@@ -0,0 +1,68 @@
+import multiprocessing
+
+import pytest
+
+import autodiff as ad
+
+x, y = ad.Variable("x"), ad.Variable("y")
+POINT = {"x": 0.7, "y": 1.3}
+
+
+def test_power_of_scaled_power_is_merged():
+    result = ad.cbrt(x + y).derivative(x, y)
+    assert str(result) == "-(2 / cbrt(x + y) ** 5 / 9)"
+    assert ad.metrics(result).tree_nodes == 12
+
+
+def test_product_rule_sum_is_factored():
+    op = ad.Const(1)
+    for i in range(1, 9):
+        op = op * (x + i * y)
+    result = op.derivative(x)
+    assert ad.metrics(result).tree_nodes <= 179
+    assert abs(result.call(POINT) - op._derivative(x).call(POINT)) < 1e-6 * abs(result.call(POINT))
+
+
+@pytest.mark.parametrize("op", [
+    (3 * x**2 * y) ** 3,
+    ad.sin(x) * ad.exp(x) / (1 + x**2),
+    x * ad.sin(y) + x * ad.cos(y) - ad.sin(y) * y,
+    -(ad.exp(x) * y) + ad.exp(x) * x * y,
+])
+def test_simplified_value_is_unchanged(op):
+    for var in (x, y):
+        derivative = op._derivative(var)
+        expected = derivative.call(POINT)
+        assert abs(derivative.simplify().call(POINT) - expected) < 1e-9 * max(abs(expected), 1)
+
+
+def test_monomials_are_left_to_the_polynomial_pass():
+    op = ad.operators.Add(3 * x**2 * y, 2 * x**2, x * y)
+    assert ad.basesimp.factor(op.get_operands()) is None
+
+
+class _FailingSimp(ad.simplify.BaseSimp):
+    def simplify(self, op):
+        raise RuntimeError("simplification failed")
+
+
+def _swollen():
+    op = ad.Const(1)
+    for i in range(1, 7):
+        op = op * ad.sin(x * i + y) + ad.exp(y / i) * x
+    return op._derivative(x)._derivative(y)
+
+
+def test_parallel_simplification_matches_serial():
+    op = _swollen()
+    assert len(ad.simplify._partition(op, 64, 2)) > 1
+    serial = ad.basesimp(op)
+    assert ad.basesimp(op, workers=2, threshold=64) == serial
+    assert op.simplify(workers=2) == serial
+    assert not multiprocessing.active_children()
+
+
+def test_parallel_simplification_shuts_down_the_pool_on_error():
+    with pytest.raises(RuntimeError, match="simplification failed"):
+        _FailingSimp().parallel(_swollen(), 2, threshold=64)
+    assert not multiprocessing.active_children()
@@ -0,0 +1,58 @@
+import math
+
+import numpy as np
+import pytest
+
+import autodiff as ad
+
+X = ad.Variable("X", (3,))
+M = ad.Variable("M", (2, 3))
+w = ad.Variable("w")
+
+RECORDS = [
+    {"X": [1, 2, 3], "M": np.arange(6).reshape(2, 3), "w": 2.0},
+    {"X": [0, 1, 0], "M": -np.ones((2, 3)), "w": -1.0},
+]
+
+
+@pytest.mark.parametrize("op", [
+    ad.sin(X) * w,
+    ad.sum(X * w),
+    ad.dot(X, X * w) + w,
+    ad.sum(M * X) * w,
+    M * w + X,
+])
+def test_batch_matches_call(op):
+    expected = [op.call(record) for record in RECORDS]
+    for values in (op.batch_call(RECORDS), list(op.stream(RECORDS, chunk_size=2))):
+        assert len(values) == len(expected)
+        for value, reference in zip(values, expected):
+            assert np.shape(value) == np.shape(reference)
+            assert np.allclose(value, reference)
+
+
+def test_batch_with_bad_record_falls_back_to_nan():
+    records = [{"X": [1, 2, 3], "w": 1}, {"X": [1, 2], "w": 1}]
+    first, second = ad.sum(X * w).batch_call(records)
+    assert first == 6
+    assert math.isnan(second.real)
+
+
+def test_call_with_wrong_shape_is_nan():
+    assert math.isnan(ad.sum(X).call(X=[1, 2]).real)
+    assert math.isnan(ad.compile(ad.sum(X))(X=[1, 2]).real)
+
+
+def test_derivative_of_nested_sum():
+    op = ad.sum(X * ad.sum(X))
+    derivative = op.derivative(X)
+    assert np.allclose(derivative.call(X=[1, 2, 3]), [12, 12, 12])
+    assert np.allclose(ad.dot(X, X * ad.sum(X)).derivative(X).call(X=[1, 2, 3]), [26, 38, 50])
+
+
+def test_variables_with_different_shapes_are_distinct():
+    scalar = ad.Variable("X")
+    assert scalar != X
+    assert len({scalar, X, ad.Variable("X", (3,))}) == 2
+    assert ad.sum(X).derivative(scalar).call(X=[1, 2, 3]) == 0
+    assert np.allclose(ad.sum(X * X).derivative(X).call(X=[1, 2, 3]), [2, 4, 6])